@@ -1,16 +1,79 @@
+import time
+_STARTED = time.perf_counter()
+
 import os
 import sys
 import json
+import bisect
+import hashlib
 import glob
+import queue
+import shutil
 import platform
+import threading
 import subprocess
-import urllib.error
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, simpledialog
+import argparse
+import select
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 
 FASTFLAGS_FILE = os.path.join("Modifications", "ClientSettings", "ClientAppSettings.json")
 BOOTSTRAPPER_URL = "https://setup.pekora.zip/PekoraPlayerLauncher.exe"
 BOOTSTRAPPER_FILE = "PekoraPlayerLauncher.exe"
+INSTALL_INDEX_FILE = os.path.join("Modifications", "install_index.json")
+DISCOVERY_FILE = os.path.join("Modifications", "prefix_discovery.json")
+SETTINGS_FILE = os.path.join("Modifications", "projexstrap_settings.json")
+LAUNCH_LOG_FILE = os.path.join("Modifications", "launch_timings.jsonl")
+TELEMETRY_LOG_FILE = os.path.join("Modifications", "client_telemetry.jsonl")
+STARTUP_LOG_FILE = os.path.join("Modifications", "startup_timings.jsonl")
+APPLIED_STATE_FILE = os.path.join("Modifications", "applied_state.json")
+PROFILES_DIR = os.path.join("Modifications", "Profiles")
+BACKUP_DIR = os.path.join("Modifications", "Backups")
+CATALOG_FILE = os.path.join("Modifications", "flag_catalog.sqlite3")
+BUNDLED_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "flag_catalog.json")
+CLIENT_FOLDERS = ("2020L", "2021M")
+MERGE_POLICIES = ("last-wins", "keep-existing", "fail-on-conflict")
+STARTUP_BUDGET_MS = 150
+FIRST_PAINT_BUDGET_MS = 500
+# longest first so DFFlag is not read as FFlag
+FLAG_TYPES = (
+    ("DFString", "string"), ("SFString", "string"), ("FString", "string"),
+    ("DFFlag", "bool"), ("SFFlag", "bool"), ("FFlag", "bool"),
+    ("DFInt", "int"), ("SFInt", "int"), ("FInt", "int"),
+    ("DFLog", "int"), ("SFLog", "int"), ("FLog", "int"),
+)
+FLAG_NAME_RE = re.compile(r"\b(?:%s)[A-Za-z0-9_]+" % "|".join(p for p, kind in FLAG_TYPES))
+DEFAULT_SETTINGS = {
+    "prestart_wineserver": True,
+    "wineserver_persist_s": 300,
+    "wine_binary": "",
+    "window_wait_s": 60,
+    "warm_cache": True,
+    "warm_budget_mb": 512,
+    "warm_ttl_s": 600,
+    "dedup_min_kb": 64,
+    "prefix_roots": [],
+    "discovery_workers": 8,
+    "discovery_timeout_s": 3,
+    "discovery_ttl_s": 30,
+    "bootstrapper_url": BOOTSTRAPPER_URL,
+    "bootstrapper_sha256": "",
+    "download_parts": 4,
+    "launch_max_concurrent": 2,
+    "launch_stagger_s": 3,
+    "launch_start_timeout_s": 30,
+    "telemetry_interval_s": 2,
+    "telemetry_log_max_kb": 2048,
+    "active_profile": "",
+    "rolled_back_to": 0,
+    "watch_enabled": False,
+    "watch_debounce_s": 2,
+    "watch_max_delay_s": 10,
+    "watch_poll_s": 5,
+    "backup_keep_per_target": 20,
+    "backup_keep_days": 30,
+}
 
 def get_system_info():
     system = platform.system().lower()
@@ -21,50 +84,576 @@ def get_system_info():
         'system_name': system
     }
 
-def get_version_roots():
-    sys_info = get_system_info()
+class StartupTimeline:
+    # Milliseconds from process start (_STARTED) to each named startup
+    # phase. The first mark of a name wins, so a phase reached again later
+    # (a second version scan) doesn't move it.
+    def __init__(self, origin=_STARTED):
+        self.origin = origin
+        self.marks = {}
+
+    def mark(self, name):
+        if name not in self.marks:
+            self.marks[name] = round((time.perf_counter() - self.origin) * 1000, 1)
+        return self.marks[name]
+
+    def save(self, path=STARTUP_LOG_FILE):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a") as f:
+                f.write(json.dumps({"time": time.time(), "marks": self.marks}) + "\n")
+        except OSError:
+            pass
+
+_startup_timeline = None
+
+def get_startup_timeline():
+    global _startup_timeline
+    if _startup_timeline is None:
+        _startup_timeline = StartupTimeline()
+    return _startup_timeline
+
+class TaskCancelled(Exception):
+    pass
+
+class BackgroundTask:
+    def __init__(self, runner, name, on_done=None, on_error=None, on_progress=None):
+        self.runner = runner
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise TaskCancelled(self.name)
+
+    def progress(self, done, total=None, message=""):
+        self.runner.results.put(("progress", self, (done, total, message)))
+
+class BackgroundRunner:
+    # Work runs on a thread pool; results and progress are queued and only
+    # dispatched from poll(), so callbacks always run on the polling (Tk) thread.
+    def __init__(self, max_workers=4):
+        self.results = queue.Queue()
+        self.active = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="projexstrap")
+
+    def submit(self, name, fn, on_done=None, on_error=None, on_progress=None):
+        task = BackgroundTask(self, name, on_done, on_error, on_progress)
+        self.active.append(task)
+
+        def run():
+            try:
+                result = fn(task)
+            except Exception as e:
+                self.results.put(("error", task, e))
+            else:
+                self.results.put(("done", task, result))
+
+        self._executor.submit(run)
+        return task
+
+    def cancel_all(self):
+        for task in self.active:
+            task.cancel()
+
+    def poll(self):
+        events = []
+        progress = {}
+        while True:
+            try:
+                kind, task, payload = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                # only the latest progress per task is worth rendering
+                if task not in progress:
+                    events.append((kind, task, None))
+                progress[task] = payload
+            else:
+                events.append((kind, task, payload))
+        for kind, task, payload in events:
+            if kind == "progress":
+                if task.on_progress and task in self.active:
+                    task.on_progress(task, *progress[task])
+                continue
+            if task in self.active:
+                self.active.remove(task)
+            if kind == "done" and task.on_done:
+                task.on_done(payload)
+            elif kind == "error" and task.on_error:
+                task.on_error(payload)
+        return len(events)
+
+    def shutdown(self, wait=False):
+        self.cancel_all()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+def load_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        with open(SETTINGS_FILE, "r") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            settings.update(data)
+    except (OSError, ValueError):
+        pass
+    return settings
+
+def save_settings(settings):
+    try:
+        os.makedirs(os.path.dirname(SETTINGS_FILE), exist_ok=True)
+        with open(SETTINGS_FILE, "w") as f:
+            json.dump(settings, f, indent=2)
+        return True
+    except Exception:
+        return False
+
+# Where launchers keep Wine prefixes: (source, directory, depth). depth 0
+# means the directory is a prefix; otherwise prefixes (folders holding
+# drive_c) are looked for up to that many levels below it.
+PREFIX_LAYOUTS = (
+    ("wine", "~/.wine", 0),
+    ("wineprefixes", "~/.local/share/wineprefixes", 1),
+    ("lutris", "~/Games", 2),
+    ("bottles", "~/.local/share/bottles/bottles", 1),
+    ("bottles", "~/.var/app/com.usebottles.bottles/data/bottles/bottles", 1),
+    ("steam", "~/.steam/steam/steamapps/compatdata", 2),
+    ("steam", "~/.local/share/Steam/steamapps/compatdata", 2),
+    ("steam", "~/.var/app/com.valvesoftware.Steam/.local/share/Steam/steamapps/compatdata", 2),
+    ("playonlinux", "~/.PlayOnLinux/wineprefix", 1),
+    ("crossover", "~/.cxoffice", 1),
+    ("crossover", "~/Library/Application Support/CrossOver/Bottles", 1),
+    ("whisky", "~/Library/Containers/com.isaacmarovitz.Whisky/Bottles", 1),
+)
+VERSION_APPS = ("ProjectX", "Pekora")
+
+_inflight_lock = threading.Lock()
+
+def _bounded_map(fn, items, workers, timeout_s, inflight=None):
+    # Runs fn over items on at most `workers` daemon threads and returns
+    # {item: (result, ms, timed_out)}. An item still running after
+    # timeout_s is given up on (a hung network mount can't stall discovery
+    # or keep the process alive), as is one that never got a free worker.
+    # inflight is a set shared between calls: an item whose earlier call is
+    # still stuck is reported as timed out without another thread.
+    items = list(dict.fromkeys(items))
+    results = {}
+    if inflight is not None:
+        with _inflight_lock:
+            for item in items:
+                if item in inflight:
+                    results[item] = (None, None, True)
+    pending = [item for item in items if item not in results]
+    if not pending:
+        return results
+    jobs = queue.Queue()
+    for item in pending:
+        jobs.put(item)
+    started = {}
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            try:
+                item = jobs.get_nowait()
+            except queue.Empty:
+                return
+            begin = time.perf_counter()
+            with lock:
+                started[item] = begin
+            if inflight is not None:
+                with _inflight_lock:
+                    inflight.add(item)
+            try:
+                result = fn(item)
+            except Exception:
+                result = None
+            finally:
+                if inflight is not None:
+                    with _inflight_lock:
+                        inflight.discard(item)
+            with lock:
+                results.setdefault(item, (result, round((time.perf_counter() - begin) * 1000, 2), False))
+
+    for _ in range(max(1, min(workers, len(pending)))):
+        threading.Thread(target=worker, daemon=True, name="projexstrap-discovery").start()
+    rounds = -(-len(pending) // max(1, workers))
+    deadline = time.perf_counter() + timeout_s * (rounds + 1)
+    while True:
+        now = time.perf_counter()
+        with lock:
+            for item, begin in started.items():
+                if item not in results and now - begin > timeout_s:
+                    results[item] = (None, round((now - begin) * 1000, 2), True)
+            if len(results) == len(items):
+                return dict(results)
+            if now > deadline:
+                for item in items:
+                    results.setdefault(item, (None, None, True))
+                return dict(results)
+        time.sleep(0.005)
+
+def _find_prefixes(directory, depth):
+    if os.path.isdir(os.path.join(directory, "drive_c")):
+        return [directory]
+    found = []
+    if depth > 0:
+        try:
+            with os.scandir(directory) as it:
+                children = sorted(e.path for e in it if e.is_dir())
+        except OSError:
+            return found
+        for child in children:
+            found.extend(_find_prefixes(child, depth - 1))
+    return found
+
+def _scan_prefix(prefix, signature=None):
+    # every Windows user in the prefix, not $USER: Wine's user folder often
+    # doesn't match the Unix login (steamuser, crossover, ...). signature,
+    # when given, gets the mtime of every folder whose change could add or
+    # remove a root.
     roots = []
-    if sys_info['is_windows']:
-        roots.extend([
-            os.path.expandvars(r"%localappdata%\ProjectX\Versions"),
-            os.path.expandvars(r"%localappdata%\Pekora\Versions"),
-        ])
-    elif sys_info['is_linux']:
-        user = os.getenv('USER', 'user')
-        roots.extend([
-            os.path.expanduser(f"~/.wine/drive_c/users/{user}/AppData/Local/ProjectX/Versions"),
-            os.path.expanduser(f"~/.wine/drive_c/users/{user}/AppData/Local/Pekora/Versions"),
-            os.path.expanduser(f"~/.local/share/wineprefixes/pekora/drive_c/users/{user}/AppData/Local/Pekora/Versions"),
-            os.path.expanduser(f"~/.local/share/wineprefixes/projectx/drive_c/users/{user}/AppData/Local/ProjectX/Versions"),
-        ])
-    elif sys_info['is_macos']:
-        user = os.getenv('USER', 'user')
-        roots.extend([
-            os.path.expanduser(f"~/.wine/drive_c/users/{user}/AppData/Local/ProjectX/Versions"),
-            os.path.expanduser(f"~/.wine/drive_c/users/{user}/AppData/Local/Pekora/Versions"),
-        ])
-        roots.extend(glob.glob(os.path.expanduser(f"~/Library/Application Support/CrossOver/Bottles/*/drive_c/users/{user}/AppData/Local/ProjectX/Versions")))
-        roots.extend(glob.glob(os.path.expanduser(f"~/Library/Application Support/CrossOver/Bottles/*/drive_c/users/{user}/AppData/Local/Pekora/Versions")))
-    return [p for p in roots if isinstance(p, str)]
-
-def iter_version_dirs():
-    for root in get_version_roots():
-        if os.path.isdir(root):
-            for d in sorted(glob.glob(os.path.join(root, "*"))):
-                if os.path.isdir(d):
-                    yield d
+    users = os.path.join(prefix, "drive_c", "users")
+    if signature is not None:
+        signature[users] = _dir_mtime(users)
+    try:
+        with os.scandir(users) as it:
+            names = sorted(e.name for e in it if e.is_dir())
+    except OSError:
+        return roots
+    for user in names:
+        local = os.path.join(users, user, "AppData", "Local")
+        if signature is not None:
+            signature[local] = _dir_mtime(local)
+        for app in VERSION_APPS:
+            if signature is not None:
+                signature[os.path.join(local, app)] = _dir_mtime(os.path.join(local, app))
+            path = os.path.join(local, app, "Versions")
+            if os.path.isdir(path):
+                roots.append(path)
+    return roots
+
+class PrefixDiscovery:
+    # Finds every Wine prefix from PREFIX_LAYOUTS, $WINEPREFIX and the
+    # prefix_roots setting, then looks for Versions folders in all of them
+    # concurrently. Results are reused for discovery_ttl_s, and saved to
+    # path so a later pass or process only re-walks a layout directory whose
+    # mtime changed and re-scans a prefix whose users/AppData folders did
+    # (force, Refresh or --rescan re-walk everything). report keeps
+    # per-prefix timings for diagnostics.
+    def __init__(self, settings=None, path=DISCOVERY_FILE):
+        self.settings = settings or load_settings()
+        self.path = path
+        self.report = []
+        self.ms = None
+        self.unreachable = set()
+        self._by_prefix = {}
+        self._saved = None
+        self._rewalk = False
+        self._finding = set()
+        self._scanning = set()
+        self._roots = None
+        self._at = 0
+        self._lock = threading.Lock()
+
+    def candidates(self):
+        candidates = []
+        if os.environ.get("WINEPREFIX"):
+            candidates.append(("env", os.path.expanduser(os.environ["WINEPREFIX"]), 0))
+        for path in self.settings.get("prefix_roots") or []:
+            candidates.append(("settings", os.path.expanduser(path), 2))
+        for source, path, depth in PREFIX_LAYOUTS:
+            candidates.append((source, os.path.expanduser(path), depth))
+        return candidates
+
+    def invalidate(self):
+        # the next pass re-walks everything instead of trusting the mtimes
+        with self._lock:
+            self._roots = None
+            self._rewalk = True
+
+    def roots(self, force=False):
+        with self._lock:
+            ttl = float(self.settings.get("discovery_ttl_s") or 0)
+            if not force and self._roots is not None and time.perf_counter() - self._at < ttl:
+                return list(self._roots)
+            self._roots = self.discover(reuse=not (force or self._rewalk))
+            self._rewalk = False
+            self._at = time.perf_counter()
+            return list(self._roots)
+
+    def _load_saved(self):
+        if self._saved is None:
+            self._saved = {"candidates": {}, "prefixes": {}, "by_prefix": {}}
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+                for key in self._saved:
+                    if isinstance(data.get(key), dict):
+                        self._saved[key] = data[key]
+            except (OSError, ValueError, TypeError, AttributeError):
+                pass
+            if not self._by_prefix:
+                self._by_prefix = dict(self._saved["by_prefix"])
+        return self._saved
+
+    def discover(self, reuse=True):
+        # Every filesystem call runs on the bounded workers, so a candidate
+        # on a hung mount only costs discovery_timeout_s, and one still
+        # stuck from an earlier pass is not handed another thread. A prefix
+        # that times out keeps the roots it had last time (listed in
+        # unreachable) instead of dropping its installs until the next good
+        # pass.
+        started = time.perf_counter()
+        workers = int(self.settings.get("discovery_workers") or 8)
+        timeout_s = float(self.settings.get("discovery_timeout_s") or 3)
+        candidates = self.candidates()
+        saved = self._load_saved() if self.path else {"candidates": {}, "prefixes": {}, "by_prefix": {}}
+        known_candidates = saved["candidates"] if reuse else {}
+        known_prefixes = saved["prefixes"] if reuse else {}
+
+        def key(candidate):
+            return f"{candidate[2]}:{candidate[1]}"
+
+        def find(candidate):
+            mtime = _dir_mtime(candidate[1])
+            cached = known_candidates.get(key(candidate))
+            if cached and cached.get("mtime") == mtime:
+                return cached
+            # ~/.steam/steam is usually a link to ~/.local/share/Steam
+            return {"mtime": mtime, "prefixes": [[prefix, os.path.realpath(prefix)]
+                                                 for prefix in _find_prefixes(candidate[1], candidate[2])]}
+
+        def scan(real):
+            cached = known_prefixes.get(real)
+            if cached and all(_dir_mtime(path) == mtime for path, mtime in cached.get("signature", {None: 0}).items()):
+                return cached
+            signature = {}
+            return {"signature": signature, "roots": _scan_prefix(real, signature)}
+        found = _bounded_map(find, candidates, workers, timeout_s, self._finding)
+        sources = {}
+        report = []
+        unreachable = set()
+        by_prefix = {}
+        walked = {}
+        for candidate in candidates:
+            entry, ms, timed_out = found[candidate]
+            if entry is not None:
+                walked[key(candidate)] = entry
+            elif key(candidate) in saved["candidates"]:
+                walked[key(candidate)] = saved["candidates"][key(candidate)]
+            if timed_out:
+                below = os.path.join(candidate[1], "")
+                kept = {p: r for p, r in self._by_prefix.items() if p == candidate[1] or p.startswith(below)}
+                for prefix, roots in kept.items():
+                    unreachable.update(roots)
+                by_prefix.update(kept)
+                report.append({"prefix": candidate[1], "source": candidate[0], "ms": ms, "timed_out": True,
+                               "roots": [r for roots in kept.values() for r in roots]})
+            for prefix, real in (entry or {}).get("prefixes", []):
+                sources.setdefault(real, (candidate[0], prefix))
+        scanned = _bounded_map(scan, list(sources), workers, timeout_s, self._scanning)
+        prefixes = {}
+        for real, (source, prefix) in sources.items():
+            entry, ms, timed_out = scanned[real]
+            if entry is not None:
+                prefixes[real] = entry
+            elif real in saved["prefixes"]:
+                prefixes[real] = saved["prefixes"][real]
+            if timed_out:
+                found_roots = self._by_prefix.get(prefix, [])
+                unreachable.update(found_roots)
+            else:
+                found_roots = [prefix + r[len(real):] for r in (entry or {}).get("roots", [])]
+            by_prefix[prefix] = found_roots
+            report.append({"prefix": prefix, "source": source, "roots": found_roots, "ms": ms, "timed_out": timed_out})
+        self._by_prefix = by_prefix
+        self.unreachable = unreachable
+        self.report = report
+        if self.path:
+            state = {"candidates": walked, "prefixes": prefixes, "by_prefix": by_prefix}
+            if state != self._saved:
+                self._saved = state
+                try:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    atomic_write(self.path, json.dumps(state).encode("utf-8"))
+                except OSError:
+                    pass
+        self.ms = round((time.perf_counter() - started) * 1000, 2)
+        return list(dict.fromkeys(r for roots in by_prefix.values() for r in roots))
+
+_prefix_discovery = None
+
+def get_prefix_discovery():
+    global _prefix_discovery
+    if _prefix_discovery is None:
+        _prefix_discovery = PrefixDiscovery()
+    return _prefix_discovery
+
+def get_version_roots():
+    if get_system_info()['is_windows']:
+        return [os.path.expandvars(rf"%localappdata%\{app}\Versions") for app in VERSION_APPS]
+    return get_prefix_discovery().roots()
+
+def _dir_mtime(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns
+
+def _scan_version_dir(path):
+    return [f for f in CLIENT_FOLDERS if os.path.isdir(os.path.join(path, f))]
+
+def _scan_root(root):
+    versions = {}
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                try:
+                    if not entry.is_dir():
+                        continue
+                    mtime = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+                versions[entry.path] = {"mtime": mtime, "folders": _scan_version_dir(entry.path)}
+    except OSError:
+        pass
+    return versions
+
+class InstallIndex:
+    # Cached view of every version root. A root is only re-listed when its
+    # mtime changes (a version folder was added/removed), and a version dir
+    # is only re-checked for 2020L/2021M when its own mtime changes.
+    def __init__(self, path=INSTALL_INDEX_FILE, roots_fn=None):
+        self.path = path
+        self.roots_fn = roots_fn or get_version_roots
+        self.roots = {}
+        self.timings = {}
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    def load(self):
+        with self._lock:
+            self._loaded = True
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+                roots = data.get("roots", {})
+                if isinstance(roots, dict):
+                    self.roots = roots
+            except (OSError, ValueError, AttributeError):
+                self.roots = {}
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump({"roots": self.roots}, f)
+            os.replace(tmp, self.path)
+            return True
+        except Exception:
+            return False
+
+    def refresh(self, force=False, task=None):
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            changed = False
+            roots = {}
+            timings = {}
+            candidates = self.roots_fn()
+            # roots discovery could not reach this time keep their last
+            # entry untouched rather than being stat'ed on a hung mount
+            unreachable = get_prefix_discovery().unreachable if self.roots_fn is get_version_roots else ()
+            for n, root in enumerate(candidates):
+                if task:
+                    task.check()
+                    task.progress(n, len(candidates), f"Scanning {root}")
+                started = time.perf_counter()
+                if root in unreachable and root in self.roots:
+                    roots[root] = self.roots[root]
+                    continue
+                cached = None if force else self.roots.get(root)
+                mtime = _dir_mtime(root)
+                if mtime is None:
+                    entry = cached if cached and cached.get("mtime") is None else {"mtime": None, "versions": {}}
+                elif cached is None or cached.get("mtime") != mtime:
+                    entry = {"mtime": mtime, "versions": _scan_root(root)}
+                else:
+                    entry = cached
+                    for ver, info in entry["versions"].items():
+                        ver_mtime = _dir_mtime(ver)
+                        if ver_mtime != info.get("mtime"):
+                            info["mtime"] = ver_mtime
+                            info["folders"] = _scan_version_dir(ver) if ver_mtime is not None else []
+                            changed = True
+                if entry is not cached:
+                    changed = True
+                roots[root] = entry
+                timings[root] = round((time.perf_counter() - started) * 1000, 2)
+            if set(roots) != set(self.roots):
+                changed = True
+            self.roots = roots
+            self.timings = timings
+            if changed:
+                self.save()
+            return changed
+
+    def version_dirs(self):
+        with self._lock:
+            dirs = []
+            for root in self.roots:
+                versions = self.roots[root]["versions"]
+                dirs.extend(v for v in sorted(versions) if versions[v].get("mtime") is not None)
+            return dirs
+
+    def client_folders(self):
+        with self._lock:
+            result = []
+            for root in self.roots:
+                versions = self.roots[root]["versions"]
+                for ver in sorted(versions):
+                    for folder in versions[ver].get("folders", []):
+                        result.append((ver, folder))
+            return result
+
+_install_index = None
+
+def get_install_index(force=False, task=None):
+    global _install_index
+    if _install_index is None:
+        _install_index = InstallIndex()
+    if force:
+        get_prefix_discovery().invalidate()
+    _install_index.refresh(force=force, task=task)
+    return _install_index
+
+def iter_version_dirs(force=False, task=None):
+    yield from get_install_index(force=force, task=task).version_dirs()
 
 def get_clientsettings_targets():
     targets = []
-    for ver in iter_version_dirs():
-        for folder in ["2020L", "2021M"]:
-            folder_path = os.path.join(ver, folder)
-            if os.path.isdir(folder_path):
-                client_dir = os.path.join(folder_path, "ClientSettings")
-                settings_path = os.path.join(client_dir, "ClientAppSettings.json")
-                targets.append((client_dir, settings_path, folder))
+    for ver, folder in get_install_index().client_folders():
+        client_dir = os.path.join(ver, folder, "ClientSettings")
+        settings_path = os.path.join(client_dir, "ClientAppSettings.json")
+        targets.append((client_dir, settings_path, folder))
     return targets
 
+def get_installed_client_folders():
+    return {folder for ver, folder in get_install_index().client_folders()}
+
 def get_executable_paths(folder):
     paths = []
     for ver in iter_version_dirs():
@@ -72,6 +661,221 @@ def get_executable_paths(folder):
         paths.append(exe)
     return paths
 
+def _scan_usage(path, min_size=0):
+    # Iterative os.scandir walk. Returns the version's size with hard links
+    # counted once, its file count, {inode key: size} of the hard-linked
+    # files, and (size, inode key, path) for every file of at least
+    # min_size bytes as dedup candidates.
+    total = files = 0
+    seen = {}
+    candidates = []
+    stack = [path]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                key = (st.st_dev, st.st_ino)
+                files += 1
+                if st.st_nlink > 1:
+                    if key in seen:
+                        continue
+                    seen[key] = st.st_size
+                total += st.st_size
+                if min_size and st.st_size >= min_size:
+                    candidates.append((st.st_size, key, entry.path))
+    return total, files, seen, candidates
+
+def _hash_file(path, limit=None):
+    h = hashlib.sha256()
+    remaining = limit
+    with open(path, "rb") as f:
+        while remaining is None or remaining > 0:
+            chunk = f.read(1 << 20 if remaining is None else min(1 << 20, remaining))
+            if not chunk:
+                break
+            h.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return h.hexdigest()
+
+def _group_identical(candidates, pool, task=None):
+    # size first, then the first 64 KiB, then the full hash; files that are
+    # already hard links of each other count as one copy
+    by_size = {}
+    for size, key, path in candidates:
+        by_size.setdefault(size, {}).setdefault(key, path)
+    groups = [(size, list(copies.values())) for size, copies in by_size.items() if len(copies) > 1]
+    for limit in (64 * 1024, None):
+        jobs = [(size, path) for size, paths in groups for path in paths]
+        if task:
+            task.check()
+            task.progress(0, len(jobs), f"Hashing {len(jobs)} candidate file(s)")
+        buckets = {}
+        for (size, path), digest in zip(jobs, pool.map(lambda job: _safe_hash(job[1], limit), jobs)):
+            if digest:
+                buckets.setdefault((size, digest), []).append(path)
+        groups = [(size, paths) for (size, digest), paths in buckets.items() if len(paths) > 1]
+    return sorted(groups, key=lambda g: g[0] * (len(g[1]) - 1), reverse=True)
+
+def _safe_hash(path, limit=None):
+    try:
+        return _hash_file(path, limit)
+    except OSError:
+        return None
+
+def stale_versions(index=None):
+    # A version is stale when every client folder (2020L/2021M) it holds is
+    # also installed in a newer version of the same root, so removing it
+    # never takes away the last install of a client. Only a newer folder
+    # with the client exe counts as installed; an empty, half-downloaded or
+    # rollback-made folder does not.
+    index = index or get_install_index()
+    stale = set()
+    for root, entry in index.roots.items():
+        versions = [(info["mtime"], ver, set(info.get("folders", [])))
+                    for ver, info in entry["versions"].items() if info.get("mtime") is not None]
+        installed = {(ver, folder) for mtime, ver, folders in versions for folder in folders
+                     if os.path.isfile(os.path.join(ver, folder, "ProjectXPlayerBeta.exe"))}
+        for mtime, ver, folders in versions:
+            newer = [{f for f in fs if (v, f) in installed} for m, v, fs in versions if m > mtime]
+            if newer and all(any(folder in f for f in newer) for folder in folders):
+                stale.add(ver)
+    return stale
+
+def analyze_installations(task=None, max_workers=8, duplicates=True, settings=None):
+    # Sizes every version folder in parallel, totals them per root, marks
+    # versions superseded for every client they hold as stale (see
+    # stale_versions) and (optionally) finds identical files across versions.
+    settings = settings or load_settings()
+    min_size = int(float(settings.get("dedup_min_kb") or 0) * 1024) if duplicates else 0
+    index = get_install_index()
+    versions = []
+    for root, entry in index.roots.items():
+        for ver, info in entry["versions"].items():
+            if info.get("mtime") is not None:
+                versions.append((root, ver, info["mtime"]))
+    result = {"roots": {}, "versions": [], "duplicates": [], "reclaimable": 0}
+    if not versions:
+        return result
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(versions)), thread_name_prefix="projexstrap-usage") as pool:
+        futures = [pool.submit(_scan_usage, ver, min_size) for root, ver, mtime in versions]
+        candidates = []
+        linked_in_root = {}
+        for n, ((root, ver, mtime), future) in enumerate(zip(versions, futures)):
+            if task:
+                task.check()
+                task.progress(n, len(versions), f"Sizing {ver}")
+            size, files, linked, found = future.result()
+            candidates.extend(found)
+            result["versions"].append({"path": ver, "root": root, "bytes": size, "files": files, "mtime": mtime})
+            totals = result["roots"].setdefault(root, {"bytes": 0, "versions": 0})
+            # a file hard-linked between versions only takes space once
+            seen = linked_in_root.setdefault(root, set())
+            totals["bytes"] += size - sum(linked[key] for key in linked if key in seen)
+            seen.update(linked)
+            totals["versions"] += 1
+        if duplicates:
+            groups = _group_identical(candidates, pool, task)
+            result["duplicates"] = [{"bytes": size, "paths": sorted(paths)} for size, paths in groups]
+            result["reclaimable"] = sum(size * (len(paths) - 1) for size, paths in groups)
+    running = {os.path.dirname(os.path.dirname(i["exe"])) for i in get_launch_engine().running()}
+    stale = stale_versions(index)
+    for v in result["versions"]:
+        v["running"] = v["path"] in running
+        v["stale"] = v["path"] in stale and not v["running"]
+    result["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+def prune_versions(paths, task=None):
+    # Only stale folders the install index knows as versions are ever
+    # removed, and never one with a client still running from it. Staleness
+    # is worked out again here, so a newer install has to still have its
+    # exe at the moment of removal.
+    known = set(iter_version_dirs())
+    stale = stale_versions()
+    running = {os.path.dirname(os.path.dirname(i["exe"])) for i in get_launch_engine().running()}
+    report = []
+    for n, path in enumerate(paths):
+        if task:
+            task.check()
+            task.progress(n, len(paths), f"Removing {path}")
+        result = {"path": path, "status": "removed", "error": None}
+        if path not in known:
+            result.update(status="failed", error="not a detected version folder")
+        elif path not in stale:
+            result.update(status="failed", error="it holds the newest install of one of its clients")
+        elif path in running:
+            result.update(status="failed", error="a client is running from it")
+        else:
+            try:
+                shutil.rmtree(path)
+            except OSError as e:
+                result.update(status="failed", error=str(e))
+        report.append(result)
+    get_install_index(force=True)
+    return report
+
+def link_duplicates(groups, task=None):
+    # Replaces every copy after the first with a hard link to it. Each file
+    # is re-hashed right before linking, and the swap goes through a temp
+    # link and os.replace so a copy is never missing. Files on another
+    # filesystem than the first copy are left alone, and copies that are
+    # gone by now (a pruned version) are skipped.
+    linked = saved = 0
+    errors = []
+    for n, group in enumerate(groups):
+        paths = [path for path in group["paths"] if os.path.isfile(path)]
+        if task:
+            task.check()
+            task.progress(n, len(groups), f"Linking {os.path.basename(group['paths'][0])}")
+        if len(paths) < 2:
+            continue
+        source = paths[0]
+        try:
+            src_st = os.stat(source)
+            digest = _hash_file(source)
+        except OSError as e:
+            errors.append(f"{source}: {e}")
+            continue
+        for path in paths[1:]:
+            tmp = f"{path}.link-{os.getpid()}"
+            try:
+                st = os.stat(path)
+                if (st.st_dev, st.st_ino) == (src_st.st_dev, src_st.st_ino):
+                    continue
+                if st.st_dev != src_st.st_dev or st.st_size != src_st.st_size or _hash_file(path) != digest:
+                    continue
+                os.link(source, tmp)
+                os.replace(tmp, path)
+                linked += 1
+                saved += st.st_size
+            except OSError as e:
+                errors.append(f"{path}: {e}")
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+    return {"linked": linked, "bytes": saved, "errors": errors}
+
+def format_size(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
 def auto_detect_value_type(value_str):
     value_str = value_str.strip()
     if value_str.lower() in ['true', 'false']:
@@ -87,6 +891,299 @@ def auto_detect_value_type(value_str):
         pass
     return value_str
 
+class FlagIndex:
+    # Sorted flag names with a parallel lowercase list for case-insensitive
+    # search. Narrowing a query (typing more characters) only re-filters the
+    # previous result instead of the whole index.
+    def __init__(self, keys=()):
+        self.keys = sorted(keys)
+        self._lower = [k.lower() for k in self.keys]
+        self._last = ("", None)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        return i < len(self.keys) and self.keys[i] == key
+
+    def position(self, key):
+        return bisect.bisect_left(self.keys, key)
+
+    def add(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return None
+        self.keys.insert(i, key)
+        self._lower.insert(i, key.lower())
+        self._last = ("", None)
+        return i
+
+    def remove(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        if i >= len(self.keys) or self.keys[i] != key:
+            return None
+        del self.keys[i]
+        del self._lower[i]
+        self._last = ("", None)
+        return i
+
+    @staticmethod
+    def matches(key, query):
+        return not query or query.lower() in key.lower()
+
+    def search(self, query):
+        query = query.strip().lower()
+        if not query:
+            return list(self.keys)
+        last_query, last_result = self._last
+        if last_result is not None and last_query and query.startswith(last_query):
+            result = [k for k in last_result if query in k.lower()]
+        else:
+            result = [k for k, low in zip(self.keys, self._lower) if query in low]
+        self._last = (query, result)
+        return list(result)
+
+def flag_type(name):
+    for prefix, kind in FLAG_TYPES:
+        if name.startswith(prefix) and len(name) > len(prefix):
+            return prefix, kind
+    return None, None
+
+def coerce_flag_value(kind, value):
+    # None when the value cannot be read as the flag's type
+    if kind == "bool":
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+            return value.strip().lower() == "true"
+        return None
+    if kind == "int":
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        try:
+            return int(str(value).strip())
+        except ValueError:
+            return None
+    if kind == "string":
+        return value if isinstance(value, str) else str(value)
+    return value
+
+class FlagCatalog:
+    # Offline list of known flags in SQLite. Names are looked up through
+    # the lowercase column index, so prefix search is a range scan.
+    def __init__(self, path=CATALOG_FILE):
+        self.path = path
+        self._db = None
+        self._lock = threading.RLock()
+
+    @property
+    def db(self):
+        with self._lock:
+            if self._db is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._db = sqlite3.connect(self.path, check_same_thread=False)
+                self._db.executescript("""
+                    CREATE TABLE IF NOT EXISTS flags (
+                        name TEXT PRIMARY KEY,
+                        lower TEXT NOT NULL,
+                        type TEXT,
+                        kind TEXT,
+                        versions TEXT NOT NULL DEFAULT '',
+                        default_value TEXT
+                    );
+                    CREATE INDEX IF NOT EXISTS flags_lower ON flags(lower);
+                """)
+            return self._db
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def count(self):
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM flags").fetchone()[0]
+
+    def _row(self, row):
+        name, type_, kind, versions, default = row
+        return {
+            "name": name,
+            "type": type_,
+            "kind": kind,
+            "versions": [v for v in versions.split(",") if v],
+            "default": json.loads(default) if default is not None else None,
+        }
+
+    def add_many(self, entries, versions=()):
+        # entries: iterable of (name, default); default may be None
+        entries = [(name, default) for name, default in entries if flag_type(name)[0]]
+        with self._lock:
+            existing = self.lookup([name for name, default in entries])
+            rows = []
+            for name, default in entries:
+                prefix, kind = flag_type(name)
+                old = existing.get(name)
+                merged = sorted(set(old["versions"] if old else ()) | set(versions))
+                if default is None and old:
+                    default = old["default"]
+                elif default is not None:
+                    default = coerce_flag_value(kind, default)
+                rows.append((name, name.lower(), prefix, kind, ",".join(merged),
+                             json.dumps(default) if default is not None else None))
+            with self.db:
+                self.db.executemany("INSERT OR REPLACE INTO flags VALUES (?, ?, ?, ?, ?, ?)", rows)
+            return len(rows)
+
+    def import_file(self, path, versions=()):
+        # JSON: {name: default}, [name, ...] or [{"name", "default", "versions"}].
+        # Anything else is treated as a text dump and scanned for flag names,
+        # taking "Name=value" / "Name: value" lines as defaults.
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return self.add_many(data.items(), versions)
+        if isinstance(data, list):
+            count = 0
+            for item in data:
+                if isinstance(item, str):
+                    count += self.add_many([(item, None)], versions)
+                elif isinstance(item, dict) and isinstance(item.get("name"), str):
+                    item_versions = tuple(item.get("versions") or ()) + tuple(versions)
+                    count += self.add_many([(item["name"], item.get("default"))], item_versions)
+            return count
+        entries = {}
+        for line in text.splitlines():
+            m = re.match(r"^\s*\"?([A-Za-z0-9_]+)\"?\s*[=:]\s*\"?(.*?)\"?,?\s*$", line)
+            if m and flag_type(m.group(1))[0]:
+                entries[m.group(1)] = auto_detect_value_type(m.group(2))
+                continue
+            for name in FLAG_NAME_RE.findall(line):
+                entries.setdefault(name, None)
+        return self.add_many(entries.items(), versions)
+
+    def lookup(self, names):
+        found = {}
+        names = list(names)
+        with self._lock:
+            for i in range(0, len(names), 500):
+                chunk = names[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for row in self.db.execute(
+                        f"SELECT name, type, kind, versions, default_value FROM flags WHERE name IN ({marks})", chunk):
+                    found[row[0]] = self._row(row)
+        return found
+
+    def get(self, name):
+        return self.lookup([name]).get(name)
+
+    def prefix(self, query, limit=20):
+        low = query.lower()
+        if not low:
+            return []
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT name, type, kind, versions, default_value FROM flags "
+                "WHERE lower >= ? AND lower < ? ORDER BY lower LIMIT ?",
+                (low, low + "\uffff", limit)).fetchall()
+        return [self._row(r) for r in rows]
+
+    def _stem_names(self, query):
+        # candidates share the type prefix when there is one, otherwise the
+        # first few characters
+        prefix, kind = flag_type(query)
+        stem = (prefix or query[:3]).lower()
+        with self._lock:
+            return stem, [r[0] for r in self.db.execute(
+                "SELECT name FROM flags WHERE lower >= ? AND lower < ?", (stem, stem + "\uffff"))]
+
+    def fuzzy(self, query, limit=5, names=None):
+        if names is None:
+            stem, names = self._stem_names(query)
+        # difflib can't reach the 0.75 cutoff outside this length window
+        low, high = len(query) * 0.6, len(query) / 0.6
+        import difflib
+        return difflib.get_close_matches(query, [n for n in names if low <= len(n) <= high], n=limit, cutoff=0.75)
+
+    def search(self, query, limit=20):
+        results = self.prefix(query, limit)
+        if len(results) < limit and query:
+            seen = {r["name"] for r in results}
+            with self._lock:
+                rows = self.db.execute(
+                    "SELECT name, type, kind, versions, default_value FROM flags WHERE lower LIKE ? ESCAPE '\\' LIMIT ?",
+                    ("%" + query.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%", limit)).fetchall()
+            results.extend(self._row(r) for r in rows if r[0] not in seen)
+        return results[:limit]
+
+    def validate(self, flags, versions=None, suggest=25, suggest_budget_s=0.5):
+        # Returns (name, problem, suggestion) for every flag that is unknown,
+        # has a value of the wrong type, or (when versions is given) is not
+        # listed for any of those clients. An empty catalog validates nothing.
+        # Known/type/version checks are one bulk lookup; "did you mean"
+        # suggestions are only looked for on the first `suggest` unknown
+        # names and within suggest_budget_s, since each one is a fuzzy scan.
+        if not self.count():
+            return []
+        issues = []
+        known = self.lookup(flags.keys())
+        stems = {}
+        deadline = time.perf_counter() + suggest_budget_s
+        for name, value in flags.items():
+            entry = known.get(name)
+            if entry is None:
+                close = None
+                if suggest > 0 and time.perf_counter() < deadline:
+                    suggest -= 1
+                    stem = (flag_type(name)[0] or name[:3]).lower()
+                    if stem not in stems:
+                        stems[stem] = self._stem_names(name)[1]
+                    close = self.fuzzy(name, 1, names=stems[stem])
+                issues.append((name, "unknown flag", close[0] if close else None))
+                continue
+            if coerce_flag_value(entry["kind"], value) is None:
+                issues.append((name, f"expected {entry['kind']} value, got {value!r}", None))
+            elif versions and entry["versions"] and not set(versions) & set(entry["versions"]):
+                issues.append((name, f"only known for {', '.join(entry['versions'])}", None))
+        return issues
+
+_flag_catalog = None
+
+def get_flag_catalog():
+    global _flag_catalog
+    if _flag_catalog is None:
+        _flag_catalog = FlagCatalog()
+        if os.path.exists(BUNDLED_CATALOG) and not _flag_catalog.count():
+            try:
+                _flag_catalog.import_file(BUNDLED_CATALOG)
+            except (OSError, sqlite3.Error):
+                pass
+    return _flag_catalog
+
+def parse_flag_value(name, value_str):
+    # The name prefix (FFlag, FInt, ...) decides the type; guess only for
+    # names without one
+    prefix, kind = flag_type(name)
+    if kind:
+        value = coerce_flag_value(kind, value_str)
+        if value is not None:
+            return value
+    return auto_detect_value_type(value_str)
+
+def format_flag_issues(issues, limit=10):
+    lines = []
+    for name, problem, suggestion in issues[:limit]:
+        hint = f" (did you mean {suggestion}?)" if suggestion else ""
+        lines.append(f" - {name}: {problem}{hint}")
+    if len(issues) > limit:
+        lines.append(f" ... and {len(issues) - limit} more")
+    return "\n".join(lines)
+
 def load_fastflags_local():
     if not os.path.exists(FASTFLAGS_FILE):
         os.makedirs(os.path.dirname(FASTFLAGS_FILE), exist_ok=True)
@@ -102,449 +1199,2301 @@ def load_fastflags_local():
 def save_fastflags_local(fastflags):
     try:
         os.makedirs(os.path.dirname(FASTFLAGS_FILE), exist_ok=True)
-        with open(FASTFLAGS_FILE, "w") as f:
-            json.dump(fastflags, f, indent=2)
+        atomic_write(FASTFLAGS_FILE, json.dumps(fastflags, indent=2).encode("utf-8"))
         return True
     except Exception:
         return False
 
-def apply_fastflags_to_clients(fastflags):
-    applied = []
-    failed = []
-    for client_dir, settings_path, folder in get_clientsettings_targets():
+class FlagStore:
+    # The one in-memory copy of the local FastFlags. version counts real
+    # changes; save() only touches disk when it moved past the last save,
+    # and reload_if_changed() only re-reads the file when its mtime moved.
+    def __init__(self, path=FASTFLAGS_FILE):
+        self.path = path
+        self.version = 0
+        self._flags = None
+        self._saved_version = 0
+        self._mtime = None
+        self._lock = threading.RLock()
+
+    def _ensure_loaded(self):
+        if self._flags is None:
+            self.load()
+
+    def load(self):
+        with self._lock:
+            flags = load_fastflags_local()
+            if not isinstance(flags, dict):
+                flags = {}
+            if flags != self._flags:
+                self._flags = flags
+                self.version += 1
+            self._saved_version = self.version
+            self._mtime = _dir_mtime(self.path)
+            return self.version
+
+    def reload_if_changed(self):
+        with self._lock:
+            if self._flags is None or _dir_mtime(self.path) != self._mtime:
+                if self.dirty:
+                    return False
+                self.load()
+                return True
+            return False
+
+    @property
+    def dirty(self):
+        return self.version != self._saved_version
+
+    def snapshot(self):
+        with self._lock:
+            self._ensure_loaded()
+            return dict(self._flags)
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._flags)
+
+    def replace(self, flags):
+        with self._lock:
+            self._ensure_loaded()
+            if flags == self._flags:
+                return False
+            self._flags = dict(flags)
+            self.version += 1
+            return True
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return False
+            if not save_fastflags_local(self._flags):
+                raise OSError(f"could not write {self.path}")
+            self._saved_version = self.version
+            self._mtime = _dir_mtime(self.path)
+            return True
+
+_flag_store = None
+
+def get_flag_store():
+    global _flag_store
+    if _flag_store is None:
+        _flag_store = FlagStore()
+    return _flag_store
+
+class MergeConflictError(ValueError):
+    def __init__(self, report):
+        super().__init__(f"{len(report['conflicts'])} conflicting flag(s)")
+        self.report = report
+
+def iter_flags_json(path, chunk_size=65536):
+    # Yields (key, value) from a top-level JSON object without loading the
+    # whole file: only the current member and one chunk are held at a time.
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8-sig") as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buf = buf[pos:] + chunk
+            pos = 0
+
+        def skip_ws():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                fill()
+
+        def expect(chars):
+            nonlocal pos
+            skip_ws()
+            if pos >= len(buf) or buf[pos] not in chars:
+                found = buf[pos] if pos < len(buf) else "end of file"
+                raise ValueError(f"{path}: expected {' or '.join(repr(c) for c in chars)}, found {found!r}")
+            pos += 1
+            return buf[pos - 1]
+
+        def decode():
+            nonlocal pos
+            skip_ws()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except ValueError:
+                    if eof:
+                        raise ValueError(f"{path}: invalid JSON value")
+                    fill()
+                    continue
+                # a number may continue in the next chunk ("1" + ".5")
+                if (not eof and not isinstance(value, (str, dict, list))
+                        and (end == len(buf) or buf[end] not in " \t\r\n,}]")):
+                    fill()
+                    continue
+                pos = end
+                return value
+
+        fill()
+        if expect("{") != "{":
+            return
+        skip_ws()
+        if pos < len(buf) and buf[pos] == "}":
+            return
+        while True:
+            key = decode()
+            if not isinstance(key, str):
+                raise ValueError(f"{path}: object keys must be strings")
+            expect(":")
+            yield key, decode()
+            if expect(",}") == "}":
+                return
+
+def expand_import_paths(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+        else:
+            files.append(path)
+    return files
+
+def merge_flag_files(paths, base=None, policy="last-wins", task=None):
+    # Merges every file into a copy of base. A conflict is a key whose value
+    # differs from what base or an earlier file already set; last-wins takes
+    # the new value, keep-existing keeps the old one and fail-on-conflict
+    # raises MergeConflictError once every file has been read.
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f"unknown merge policy {policy!r}")
+    merged = dict(base or {})
+    origin = {key: "existing" for key in merged}
+    report = {"policy": policy, "files": [], "added": [], "conflicts": [], "unchanged": 0}
+    files = expand_import_paths(paths)
+    for n, path in enumerate(files):
+        if task:
+            task.check()
+            task.progress(n, len(files), f"Reading {os.path.basename(path)}")
+        count = 0
+        for key, value in iter_flags_json(path):
+            count += 1
+            if key not in merged:
+                merged[key] = value
+                origin[key] = path
+                report["added"].append(key)
+            elif merged[key] == value and type(merged[key]) is type(value):
+                report["unchanged"] += 1
+            else:
+                report["conflicts"].append({"key": key, "old": merged[key], "old_source": origin[key],
+                                            "new": value, "new_source": path})
+                if policy == "last-wins":
+                    merged[key] = value
+                    origin[key] = path
+        report["files"].append((path, count))
+    if policy == "fail-on-conflict" and report["conflicts"]:
+        raise MergeConflictError(report)
+    report["changed"] = bool(report["added"]) or (policy == "last-wins" and bool(report["conflicts"]))
+    return merged, report
+
+def import_fastflags_files(paths, policy="last-wins", task=None, dry_run=False):
+    store = get_flag_store()
+    merged, report = merge_flag_files(paths, store.snapshot(), policy, task)
+    if report["changed"] and not dry_run:
+        store.replace(merged)
+        store.save()
+    return merged, report
+
+def format_merge_report(report, limit=10):
+    total = sum(count for path, count in report["files"])
+    lines = [f"Read {total} flag(s) from {len(report['files'])} file(s) ({report['policy']})."]
+    lines.append(f"Added {len(report['added'])}, unchanged {report['unchanged']}, conflicts {len(report['conflicts'])}.")
+    for c in report["conflicts"][:limit]:
+        kept = c["new"] if report["policy"] == "last-wins" else c["old"]
+        lines.append(f" - {c['key']}: {c['old']!r} ({os.path.basename(c['old_source'])}) vs "
+                     f"{c['new']!r} ({os.path.basename(c['new_source'])}) -> {kept!r}")
+    if len(report["conflicts"]) > limit:
+        lines.append(f" ... and {len(report['conflicts']) - limit} more")
+    return "\n".join(lines)
+
+def _serialize_flags(fastflags):
+    data = json.dumps(fastflags, indent=2).encode("utf-8")
+    return data, hashlib.sha256(data).hexdigest()
+
+def _file_digest(path, size):
+    # a size mismatch already proves the file differs, so skip reading it
+    try:
+        if os.path.getsize(path) != size:
+            return None
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def atomic_write(path, data):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
         try:
-            os.makedirs(client_dir, exist_ok=True)
-            if os.path.exists(settings_path):
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def _stat_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+def load_applied_state():
+    try:
+        with open(APPLIED_STATE_FILE, "r") as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_applied_state(state):
+    try:
+        os.makedirs(os.path.dirname(APPLIED_STATE_FILE), exist_ok=True)
+        atomic_write(APPLIED_STATE_FILE, json.dumps(state).encode("utf-8"))
+    except OSError:
+        pass
+
+class BackupStore:
+    # Every ClientAppSettings.json version ever replaced or written, stored
+    # once per distinct content under objects/<sha[:2]>/<sha> no matter how
+    # many targets share it. history.json maps each target to a list of
+    # {"time", "sha", "kind"} entries. A "before" entry is stamped just ahead
+    # of the pass that replaced it (its file mtime is kept as "mtime"), so
+    # each pass adds one restore point for what it overwrote and retention
+    # never drops content the same pass captured. Retention is per target
+    # (backup_keep_per_target entries, backup_keep_days), and objects no
+    # longer referenced are removed on commit.
+    def __init__(self, directory=BACKUP_DIR, settings=None):
+        settings = settings or load_settings()
+        self.directory = directory
+        self.keep = int(settings.get("backup_keep_per_target") or 0)
+        self.keep_days = float(settings.get("backup_keep_days") or 0)
+        self.history = None
+        self.stamp = None
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    @property
+    def history_path(self):
+        return os.path.join(self.directory, "history.json")
+
+    def object_path(self, sha):
+        return os.path.join(self.directory, "objects", sha[:2], sha)
+
+    def load(self):
+        with self._lock:
+            try:
+                with open(self.history_path, "r") as f:
+                    history = json.load(f)
+                self.history = history if isinstance(history, dict) else {}
+            except (OSError, ValueError):
+                self.history = {}
+            return self.history
+
+    def begin(self):
+        # one apply/rollback pass shares one timestamp, so it is one point
+        with self._lock:
+            if self.history is None:
+                self.load()
+            self.stamp = time.time()
+
+    def put(self, data, sha=None):
+        sha = sha or hashlib.sha256(data).hexdigest()
+        path = self.object_path(sha)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write(path, data)
+        return sha
+
+    def get(self, sha):
+        with open(self.object_path(sha), "rb") as f:
+            return f.read()
+
+    def record(self, target, data, sha=None, kind="applied", when=None, mtime=None):
+        sha = self.put(data, sha)
+        with self._lock:
+            if self.history is None or self.stamp is None:
+                self.begin()
+            entries = self.history.setdefault(target, [])
+            if entries and entries[-1]["sha"] == sha:
+                return sha
+            entry = {"time": when if when is not None else self.stamp, "sha": sha, "kind": kind}
+            if mtime is not None:
+                entry["mtime"] = mtime
+            entries.append(entry)
+            self._dirty = True
+        return sha
+
+    def capture(self, target):
+        # keep the content about to be overwritten, unless it is already the
+        # newest entry for this target
+        try:
+            with open(target, "rb") as f:
+                data = f.read()
+            mtime = os.stat(target).st_mtime
+        except OSError:
+            return None
+        with self._lock:
+            if self.history is None or self.stamp is None:
+                self.begin()
+            when = self.stamp - 0.001
+        return self.record(target, data, kind="before", when=when, mtime=mtime)
+
+    def prune(self):
+        with self._lock:
+            if self.history is None:
+                self.load()
+            cutoff = time.time() - self.keep_days * 86400 if self.keep_days else None
+            for target, entries in list(self.history.items()):
+                kept = [e for e in entries if cutoff is None or e["time"] >= cutoff] or entries[-1:]
+                if self.keep:
+                    kept = kept[-self.keep:]
+                if len(kept) != len(entries):
+                    self.history[target] = kept
+                    self._dirty = True
+            live = {e["sha"] for entries in self.history.values() for e in entries}
+            removed = 0
+            for path in glob.glob(os.path.join(self.directory, "objects", "*", "*")):
+                if os.path.basename(path) not in live:
+                    try:
+                        os.remove(path)
+                        removed += 1
+                    except OSError:
+                        pass
+            return removed
+
+    def commit(self, force=False):
+        with self._lock:
+            if not (self._dirty or force):
+                return False
+            self.prune()
+            os.makedirs(self.directory, exist_ok=True)
+            atomic_write(self.history_path, json.dumps(self.history).encode("utf-8"))
+            self._dirty = False
+            return True
+
+    def points(self):
+        # distinct moments any target changed, newest first
+        with self._lock:
+            if self.history is None:
+                self.load()
+            times = {}
+            for target, entries in self.history.items():
+                for e in entries:
+                    point = times.setdefault(e["time"], {"time": e["time"], "targets": 0, "kinds": set()})
+                    point["targets"] += 1
+                    point["kinds"].add(e["kind"])
+            return sorted(times.values(), key=lambda p: p["time"], reverse=True)
+
+    def state_at(self, target, when):
+        with self._lock:
+            if self.history is None:
+                self.load()
+            entry = None
+            for e in self.history.get(target, []):
+                if e["time"] <= when:
+                    entry = e
+            return entry
+
+    def rollback(self, when, targets=None, task=None):
+        # Restores every target (or only `targets`) to its content as of
+        # `when`. The restore itself is recorded, so it can be undone too.
+        # Targets whose client folder is gone are skipped, so a rollback
+        # never brings back a deleted or pruned version.
+        with self._lock:
+            self.begin()
+            targets = list(targets or self.history)
+        live = {settings_path for client_dir, settings_path, folder in get_clientsettings_targets()}
+        report = []
+        for n, target in enumerate(targets):
+            if task:
+                task.check()
+                task.progress(n, len(targets), f"Restoring {target}")
+            entry = self.state_at(target, when)
+            result = {"path": target, "status": "skipped", "error": None}
+            if target not in live:
+                result["error"] = "client folder no longer exists"
+            elif entry is None:
+                result["error"] = "no backup at or before that point"
+            else:
                 try:
-                    os.replace(settings_path, settings_path + ".bak")
-                except Exception:
-                    pass
-            with open(settings_path, "w") as f:
-                json.dump(fastflags, f, indent=2)
-            applied.append(settings_path)
-        except Exception:
-            failed.append((settings_path, folder))
-    return applied, failed
+                    data = self.get(entry["sha"])
+                    if _file_digest(target, len(data)) != entry["sha"]:
+                        self.capture(target)
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        atomic_write(target, data)
+                        self.record(target, data, entry["sha"], "rollback")
+                        result["status"] = "written"
+                except OSError as e:
+                    result["status"] = "failed"
+                    result["error"] = str(e)
+            report.append(result)
+        self.commit()
+        return report
 
-def launch_executable(path):
-    sys_info = get_system_info()
+_backup_store = None
+
+def get_backup_store():
+    global _backup_store
+    if _backup_store is None:
+        _backup_store = BackupStore()
+    return _backup_store
+
+def resolve_backup_point(spec, store=None):
+    # "previous" is the point before the newest; N is the Nth newest point
+    # (1 = newest); anything else is a Unix timestamp
+    points = (store or get_backup_store()).points()
+    if spec == "previous":
+        spec = "2"
+    if str(spec).isdigit() and int(spec) < 100000:
+        n = int(spec)
+        if not 1 <= n <= len(points):
+            raise ValueError(f"there are only {len(points)} backup point(s)")
+        return points[n - 1]["time"]
+    return float(spec)
+
+def _apply_target(client_dir, settings_path, folder, data, digest, known=None, backups=None):
+    # known is [digest, size, mtime_ns] from the last apply; when the file's
+    # size and mtime still match it, the digest is trusted without a read
+    started = time.perf_counter()
+    result = {"path": settings_path, "folder": folder, "status": "written", "error": None, "digest": digest}
     try:
-        if sys_info['is_windows']:
-            subprocess.Popen([path, "--app"])
+        signature = _stat_signature(settings_path)
+        if known and signature and known[0] == digest and known[1:] == signature:
+            result["status"] = "skipped"
+        elif _file_digest(settings_path, len(data)) == digest:
+            result["status"] = "skipped"
         else:
-            env = os.environ.copy()
-            if sys_info['is_linux']:
-                env.update({
-                    "__NV_PRIME_RENDER_OFFLOAD": "1",
-                    "__GLX_VENDOR_LIBRARY_NAME": "nvidia",
-                })
-            wine_cmd = "wine64"
-            try:
-                subprocess.check_output([wine_cmd, "--version"], stderr=subprocess.DEVNULL)
-            except Exception:
-                wine_cmd = "wine"
-            subprocess.Popen([wine_cmd, path, "--app"], env=env)
-        return True, None
+            os.makedirs(client_dir, exist_ok=True)
+            if backups and signature:
+                backups.capture(settings_path)
+            atomic_write(settings_path, data)
+            signature = _stat_signature(settings_path)
+            if backups:
+                backups.record(settings_path, data, digest, "applied")
+        result["state"] = [digest] + signature if signature else None
     except Exception as e:
-        return False, str(e)
+        result["status"] = "failed"
+        result["error"] = str(e)
+    result["ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+def apply_fastflags_to_clients(fastflags, task=None, max_workers=8, folder_flags=None):
+    # Returns one report entry per target: status is skipped (content hash
+    # already matches), written or failed, with the time spent on it.
+    # folder_flags maps a client folder (2020L/2021M) to the flags that
+    # folder should get instead of fastflags.
+    payloads = {}
+
+    def payload(folder):
+        flags = folder_flags.get(folder, fastflags) if folder_flags else fastflags
+        key = folder if folder_flags and folder in folder_flags else None
+        if key not in payloads:
+            payloads[key] = _serialize_flags(flags)
+        return payloads[key]
+
+    targets = get_clientsettings_targets()
+    report = []
+    if not targets:
+        return report
+    state = load_applied_state()
+    backups = get_backup_store()
+    backups.begin()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(targets)), thread_name_prefix="projexstrap-apply") as pool:
+        futures = [pool.submit(_apply_target, client_dir, settings_path, folder, *payload(folder),
+                               state.get(settings_path), backups)
+                   for client_dir, settings_path, folder in targets]
+        try:
+            for n, future in enumerate(futures):
+                if task:
+                    task.check()
+                result = future.result()
+                report.append(result)
+                if task:
+                    task.progress(n + 1, len(targets), f"{result['status'].capitalize()} {result['folder']}: {result['path']}")
+        except TaskCancelled:
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            changed = False
+            for result in report:
+                if result.get("state") and state.get(result["path"]) != result["state"]:
+                    state[result["path"]] = result["state"]
+                    changed = True
+            if changed:
+                save_applied_state(state)
+            backups.commit()
+    return report
+
+class ProfileManager:
+    # A profile is Modifications/Profiles/<name>.json:
+    #   {"base": <profile name, or omitted for the local FastFlags>,
+    #    "flags": {...}, "folders": {"2020L": {...}, "2021M": {...}}}
+    # The effective flags for a folder are base, then flags, then
+    # folders[folder]. Merged views are cached against the mtimes of every
+    # layer in the chain (and the FlagStore version for the local base), so
+    # they are only rebuilt when a layer actually changed.
+    def __init__(self, directory=PROFILES_DIR, store=None):
+        self.directory = directory
+        self.store = store or get_flag_store()
+        self._docs = {}
+        self._views = {}
+        self._lock = threading.RLock()
+
+    def path(self, name):
+        if not name or os.sep in name or (os.altsep and os.altsep in name) or name.startswith("."):
+            raise ValueError(f"invalid profile name {name!r}")
+        return os.path.join(self.directory, name + ".json")
+
+    def names(self):
+        try:
+            return sorted(f[:-5] for f in os.listdir(self.directory) if f.endswith(".json"))
+        except OSError:
+            return []
+
+    def load(self, name):
+        path = self.path(name)
+        mtime = _dir_mtime(path)
+        if mtime is None:
+            raise KeyError(f"no profile named {name!r}")
+        with self._lock:
+            cached = self._docs.get(name)
+            if cached and cached[0] == mtime:
+                return cached[1], mtime
+            with open(path, "r") as f:
+                doc = json.load(f)
+            if not isinstance(doc, dict):
+                raise ValueError(f"{path}: profile must be a JSON object")
+            doc.setdefault("flags", {})
+            doc.setdefault("folders", {})
+            self._docs[name] = (mtime, doc)
+            return doc, mtime
+
+    def save(self, name, doc):
+        os.makedirs(self.directory, exist_ok=True)
+        atomic_write(self.path(name), json.dumps(doc, indent=2).encode("utf-8"))
+
+    def delete(self, name):
+        os.remove(self.path(name))
+        with self._lock:
+            self._docs.pop(name, None)
+
+    def _chain(self, name):
+        chain = []
+        while name:
+            if name in chain:
+                raise ValueError(f"profile {name!r} inherits from itself")
+            chain.append(name)
+            name = self.load(name)[0].get("base")
+        return chain
+
+    def signature(self, name):
+        chain = self._chain(name)
+        return tuple((n, self.load(n)[1]) for n in chain) + (("local", self.store.version),)
+
+    def view(self, name, folder=None):
+        with self._lock:
+            signature = self.signature(name)
+            key = (name, folder)
+            cached = self._views.get(key)
+            if cached and cached[0] == signature:
+                return cached[1]
+            merged = self.store.snapshot()
+            for layer in reversed(self._chain(name)):
+                doc = self.load(layer)[0]
+                merged.update(doc["flags"])
+                if folder:
+                    merged.update(doc["folders"].get(folder, {}))
+            self._views[key] = (signature, merged)
+            return merged
+
+    def folder_views(self, name):
+        return {folder: self.view(name, folder) for folder in CLIENT_FOLDERS}
+
+    def warm(self):
+        # precompute every profile's views so the first switch is instant
+        for name in self.names():
+            try:
+                self.view(name)
+                self.folder_views(name)
+            except (KeyError, ValueError, OSError):
+                pass
+
+_profile_manager = None
+
+def get_profile_manager():
+    global _profile_manager
+    if _profile_manager is None:
+        _profile_manager = ProfileManager()
+    return _profile_manager
+
+def apply_profile(name, task=None):
+    # Only targets whose effective flags differ from what was last applied
+    # are written; the rest are skipped from the recorded digests.
+    manager = get_profile_manager()
+    report = apply_fastflags_to_clients(manager.view(name), task=task, folder_flags=manager.folder_views(name))
+    settings = load_settings()
+    if settings.get("active_profile") != name or settings.get("rolled_back_to"):
+        settings["active_profile"] = name
+        settings["rolled_back_to"] = 0
+        save_settings(settings)
+    return report
+
+def apply_local_flags(fastflags, task=None):
+    # A plain apply (not a profile switch) leaves no profile active, so the
+    # watcher keeps these flags applied instead of switching back.
+    report = apply_fastflags_to_clients(fastflags, task=task)
+    settings = load_settings()
+    if settings.get("active_profile") or settings.get("rolled_back_to"):
+        settings["active_profile"] = ""
+        settings["rolled_back_to"] = 0
+        save_settings(settings)
+    return report
+
+def rollback_clients(when, targets=None, task=None):
+    # A rollback is what should stay applied now: no profile is active and
+    # the watcher leaves the restored files alone until the next apply.
+    report = get_backup_store().rollback(when, targets=targets, task=task)
+    settings = load_settings()
+    settings["active_profile"] = ""
+    settings["rolled_back_to"] = when
+    save_settings(settings)
+    return report
+
+def reapply_current(task=None):
+    # the active profile if one was switched to, otherwise the local flags;
+    # nothing while a rollback is in place
+    settings = load_settings()
+    if settings.get("rolled_back_to"):
+        return []
+    name = settings.get("active_profile")
+    if name and name in get_profile_manager().names():
+        return apply_profile(name, task=task)
+    flags = get_flag_store().snapshot()
+    return apply_fastflags_to_clients(flags, task=task) if flags else []
+
+class _Inotify:
+    IN_ATTRIB = 0x4
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_MOVE_SELF = 0x800
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            | IN_DELETE_SELF | IN_MOVE_SELF)
 
-class Projexstrap(tk.Tk):
     def __init__(self):
-        super().__init__()
-        self.title("Projexstrap")
-        self.geometry("920x640")
-        self.minsize(880, 560)
-        self.bg = "#151515"     # main background
-        self.panel = "#252525"  # panels
-        self.card = "#252525"   # card surfaces
-        self.fg = "#e6eef8"     # text
-        self.sub = "#9aa9ba"    # secondary text
-        self.accent = "#606060" # accent
-        self.warn = "#f0b429"
-        self.error = "#f97373"
-        self.configure(bg=self.bg)
-        self.style = ttk.Style(self)
-        self._setup_style()
-        self.fastflags = load_fastflags_local()
-        self.create_layout()
-        self.refresh_version_list()
-        self.refresh_fastflags_view()
-        self.refresh_debug_info()
-
-    def _setup_style(self):
-        self.style.theme_use('clam')
-        self.style.configure("TFrame", background=self.panel)
-        self.style.configure("Card.TFrame", background=self.card, relief="flat")
-        self.style.configure("TLabel", background=self.panel, foreground=self.fg, font=("Segoe UI", 10))
-        self.style.configure("Heading.TLabel", font=("Segoe UI Semibold", 14), foreground=self.fg)
-        self.style.configure("Sub.TLabel", foreground=self.sub, font=("Segoe UI", 9))
-        self.style.configure("TButton", background=self.accent, foreground=self.bg, font=("Segoe UI Semibold", 10))
-        self.style.map("TButton", background=[('active', '#404040')])
-        self.style.configure("Accent.TButton", background=self.accent, foreground=self.bg, font=("Segoe UI Semibold", 10))
-        self.style.configure("Danger.TButton", background=self.error, foreground=self.bg)
-        self.style.configure("TEntry", fieldbackground=self.card, background=self.card, foreground=self.fg)
-        self.style.configure("Treeview", background=self.card, fieldbackground=self.card, foreground=self.fg, rowheight=24)
-        self.style.map("Treeview", background=[("selected", "#404040")], foreground=[("selected", self.fg)])
-        self.style.configure("Vertical.TScrollbar", background=self.card, troughcolor=self.panel, arrowcolor=self.accent)
-
-    def create_layout(self):
-        top = ttk.Frame(self, style="TFrame")
-        top.pack(fill="x", padx=18, pady=14)
-
-        ttk.Label(top, text="Projexstrap", style="Heading.TLabel").pack(side="left")
-        ttk.Label(top, text="• Projexstrap - Dark", style="Sub.TLabel").pack(side="left", padx=(8,0))
-
-        container = ttk.Frame(self, style="TFrame")
-        container.pack(fill="both", expand=True, padx=18, pady=(0,18))
-
-        left = ttk.Frame(container, width=260, style="Card.TFrame")
-        left.pack(side="left", fill="y", padx=(0,12), pady=2)
-        left.pack_propagate(False)
-
-        right = ttk.Frame(container, style="TFrame")
-        right.pack(side="left", fill="both", expand=True)
-
-        ttk.Label(left, text="Quick Actions", style="Sub.TLabel").pack(anchor="w", padx=14, pady=(8,4))
-        pad = {"padx": 12, "pady": 6, "ipadx": 6, "ipady": 6}
-        ttk.Button(left, text="Launch 2020 (2020L)", style="Accent.TButton", command=lambda: self.launch_version_ui("2020L")).pack(fill="x", **pad)
-        ttk.Button(left, text="Launch 2021 (2021M)", style="Accent.TButton", command=lambda: self.launch_version_ui("2021M")).pack(fill="x", **pad)
-        ttk.Button(left, text="Set FastFlags", command=self.open_fastflags_editor).pack(fill="x", **pad)
-        btn_dl = ttk.Button(left, text="Download/Update Bootstrapper (MAINTENANCE)", state="disabled")
-        btn_dl.pack(fill="x", **pad)
-
-        ttk.Button(left, text="Debug Info", command=self.open_debug_window).pack(fill="x", **pad)
-        ttk.Separator(left).pack(fill="x", padx=12, pady=(6,12))
-        bb = ttk.Frame(left, style="Card.TFrame")
-        bb.pack(fill="x", padx=12, pady=(0,12))
-        ttk.Label(bb, text="Bootstrapper", style="Sub.TLabel").pack(anchor="w", padx=8, pady=(8,0))
-        self.bs_status = ttk.Label(bb, text="Checking...", style="TLabel")
-        self.bs_status.pack(anchor="w", padx=8, pady=(2,10))
-
-        tabs = ttk.Notebook(right)
-        tabs.pack(fill="both", expand=True)
-
-        frame_versions = ttk.Frame(tabs, style="TFrame")
-        tabs.add(frame_versions, text="Versions")
-
-        ttk.Label(frame_versions, text="Detected Installations", style="Sub.TLabel").pack(anchor="w", padx=14, pady=(12,6))
-        self.versions_tree = ttk.Treeview(frame_versions, columns=("path",), show="headings", selectmode="browse", height=10)
-        self.versions_tree.heading("path", text="Installation path")
-        self.versions_tree.column("path", anchor="w", width=640)
-        self.versions_tree.pack(fill="both", padx=14, pady=(0,8), expand=True)
-        vbtnframe = ttk.Frame(frame_versions, style="TFrame")
-        vbtnframe.pack(fill="x", padx=14, pady=(0,12))
-        ttk.Button(vbtnframe, text="Refresh", command=self.refresh_version_list).pack(side="left")
-        ttk.Button(vbtnframe, text="Open in Explorer", command=self.open_selected_path).pack(side="left", padx=6)
-        ttk.Button(vbtnframe, text="Launch selected Client", command=self.launch_selected).pack(side="left", padx=6)
-
-        frame_flags = ttk.Frame(tabs, style="TFrame")
-        tabs.add(frame_flags, text="FastFlags")
-
-        topbar = ttk.Frame(frame_flags, style="TFrame")
-        topbar.pack(fill="x", padx=14, pady=(12,8))
-        ttk.Button(topbar, text="Open Editor", command=self.open_fastflags_editor).pack(side="left")
-        ttk.Button(topbar, text="Apply to Clients", command=self.apply_fastflags_ui).pack(side="left", padx=6)
-        ttk.Button(topbar, text="Import JSON...", command=self.import_fastflags_from_file).pack(side="left", padx=6)
-
-        self.flags_preview = tk.Text(frame_flags, height=16, wrap="none", bg=self.card, fg=self.fg, bd=0, padx=10, pady=8)
-        self.flags_preview.pack(fill="both", expand=True, padx=14, pady=(0,12))
-
-        frame_debug = ttk.Frame(tabs, style="TFrame")
-        tabs.add(frame_debug, text="Debug")
-
-        ttk.Label(frame_debug, text="Quick Debug", style="Sub.TLabel").pack(anchor="w", padx=14, pady=(12,6))
-        self.debug_text = tk.Text(frame_debug, height=20, bg=self.card, fg=self.fg, bd=0, padx=10, pady=8)
-        self.debug_text.pack(fill="both", expand=True, padx=14, pady=(0,12))
-
-    def refresh_version_list(self):
-        for i in self.versions_tree.get_children():
-            self.versions_tree.delete(i)
-        inserted = 0
-        for ver in iter_version_dirs():
-            self.versions_tree.insert("", "end", values=(ver,))
-            inserted += 1
-        if inserted == 0:
-            self.versions_tree.insert("", "end", values=("No installations found",))
-        self.refresh_bs_status()
-        self.refresh_fastflags_view()
-
-    def open_selected_path(self):
-        sel = self.versions_tree.selection()
-        if not sel:
-            messagebox.showinfo("Open", "No path selected")
-            return
-        path = self.versions_tree.item(sel[0])['values'][0]
-        if path and os.path.isdir(path):
-            if get_system_info()['is_windows']:
-                subprocess.Popen(["explorer", os.path.normpath(path)])
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._rm = libc.inotify_rm_watch
+        self._rm.argtypes = (ctypes.c_int, ctypes.c_int)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+
+    def sync(self, paths):
+        # returns how many paths gained a watch
+        paths = set(paths)
+        for path in list(self.watches):
+            if path not in paths:
+                self._rm(self.fd, self.watches.pop(path))
+        added = 0
+        for path in paths - set(self.watches):
+            wd = self._add(self.fd, os.fsencode(path), self.MASK)
+            if wd >= 0:
+                self.watches[path] = wd
+                added += 1
+        return added
+
+    def wait(self, timeout):
+        # True when at least one event arrived; the events are discarded
+        # because any change under a watched path means the same rescan
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        self.drain()
+        return True
+
+    def drain(self):
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        os.close(self.fd)
+
+class FlagWatcher:
+    # Keeps the current flags applied while client updates add version
+    # folders or overwrite ClientAppSettings.json. Changes are seen through
+    # inotify on Linux or by stat-polling watch_poll_s elsewhere. A re-apply
+    # runs watch_debounce_s after the last change, and never later than
+    # watch_max_delay_s after the first one. Idle cost is a blocked select
+    # plus an index stat pass every watch_poll_s.
+    def __init__(self, apply_fn=reapply_current, settings=None, use_inotify=None):
+        settings = settings or load_settings()
+        self.apply_fn = apply_fn
+        self.debounce_s = float(settings.get("watch_debounce_s") or 2)
+        self.max_delay_s = max(self.debounce_s, float(settings.get("watch_max_delay_s") or 10))
+        self.poll_s = float(settings.get("watch_poll_s") or 5)
+        self.use_inotify = get_system_info()['is_linux'] if use_inotify is None else use_inotify
+        self.applies = 0
+        self.last_report = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def watch_paths(self):
+        index = get_install_index()
+        paths = [r for r in index.roots if os.path.isdir(r)]
+        paths.extend(index.version_dirs())
+        for ver, folder in index.client_folders():
+            client = os.path.join(ver, folder)
+            paths.append(client)
+            settings_dir = os.path.join(client, "ClientSettings")
+            if os.path.isdir(settings_dir):
+                paths.append(settings_dir)
+        return paths
+
+    def snapshot(self):
+        # what the polling fallback compares between rounds
+        signature = {}
+        for path in self.watch_paths():
+            signature[path] = _dir_mtime(path)
+        for client_dir, settings_path, folder in get_clientsettings_targets():
+            signature[settings_path] = _stat_signature(settings_path)
+        return signature
+
+    def apply(self):
+        try:
+            self.last_report = self.apply_fn()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+        self.applies += 1
+
+    def run(self):
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify()
+            except (OSError, AttributeError):
+                inotify = None
+        try:
+            self.apply()
+            first = last = None
+            previous = None
+            if inotify:
+                inotify.sync(self.watch_paths())
             else:
-                try:
-                    subprocess.Popen(["xdg-open", path])
-                except Exception:
-                    messagebox.showinfo("Open", f"Can't open folder on your platform: {path}")
+                previous = self.snapshot()
+            while not self._stop.is_set():
+                if inotify:
+                    # a root or version that appeared since the last round
+                    # counts as a change even before it produces events
+                    appeared = inotify.sync(self.watch_paths())
+                    changed = inotify.wait(self.poll_s if first is None else 0.25) or appeared > 0
+                else:
+                    self._stop.wait(self.poll_s if first is None else 0.25)
+                    current = self.snapshot()
+                    changed, previous = current != previous, current
+                now = time.monotonic()
+                if changed:
+                    first = first or now
+                    last = now
+                if first is not None and (now - last >= self.debounce_s or now - first >= self.max_delay_s):
+                    self.apply()
+                    first = last = None
+                    # our own writes are not client drift
+                    if inotify:
+                        inotify.sync(self.watch_paths())
+                        inotify.drain()
+                    else:
+                        previous = self.snapshot()
+        finally:
+            if inotify:
+                inotify.close()
+
+    def start(self):
+        # clearing first lets a thread that is still winding down keep going
+        self._stop.clear()
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.run, name="projexstrap-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+def summarize_apply(report):
+    counts = {"written": 0, "skipped": 0, "failed": 0}
+    for result in report:
+        counts[result["status"]] += 1
+    return counts
+
+class DownloadError(Exception):
+    pass
+
+def _http_open(url, start=None, end=None, timeout=30):
+    # imported here: http.client pulls in ssl and email, which every
+    # headless apply/list/launch would otherwise pay for at startup
+    import urllib.request
+    headers = {"User-Agent": "Projexstrap"}
+    if start is not None:
+        headers["Range"] = f"bytes={start}-" if end is None else f"bytes={start}-{end}"
+    return urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout)
+
+def _probe_download(url, timeout=30):
+    # One ranged GET tells us the size, whether ranges work and the validator
+    with _http_open(url, 0, 0, timeout) as resp:
+        info = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified"),
+                "ranges": resp.status == 206, "size": None}
+        if resp.status == 206:
+            total = (resp.headers.get("Content-Range") or "").rpartition("/")[2]
+            info["size"] = int(total) if total.isdigit() else None
+        elif resp.headers.get("Content-Length", "").isdigit():
+            info["size"] = int(resp.headers["Content-Length"])
+    return info
+
+class Download:
+    # Downloads url into dest + ".part", keeping per-range progress in
+    # dest + ".part.json" so an interrupted or cancelled run resumes where
+    # it stopped. With a known size and Range support the file is split
+    # into parallel ranges. The finished file is checked against the
+    # expected size/sha256 and only then swapped in with os.replace.
+    def __init__(self, url, dest, sha256=None, size=None, parts=1, chunk_size=256 * 1024,
+                 retries=5, timeout=30, task=None):
+        self.url = url
+        self.dest = dest
+        self.part = dest + ".part"
+        self.state_path = self.part + ".json"
+        self.sha256 = (sha256 or "").lower() or None
+        self.size = size
+        self.parts = max(1, int(parts or 1))
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.timeout = timeout
+        self.task = task
+        self.state = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _load_state(self, probe):
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+            same = (state.get("url") == self.url and state.get("size") == probe["size"]
+                    and state.get("etag") == probe["etag"] and state.get("last_modified") == probe["last_modified"])
+            if same and probe["ranges"] and os.path.exists(self.part):
+                return state
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _new_state(self, probe):
+        size = probe["size"]
+        if size and probe["ranges"] and self.parts > 1:
+            step = -(-size // self.parts)
+            ranges = [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
         else:
-            messagebox.showinfo("Open", f"Path not found: {path}")
+            ranges = [[0, size - 1 if size else None, 0]]
+        with open(self.part, "wb") as f:
+            if size and len(ranges) > 1:
+                f.truncate(size)
+        return {"url": self.url, "size": size, "etag": probe["etag"],
+                "last_modified": probe["last_modified"], "ranges": ranges}
+
+    def _save_state(self):
+        with self._lock:
+            data = json.dumps(self.state).encode("utf-8")
+        try:
+            atomic_write(self.state_path, data)
+        except OSError:
+            pass
+
+    def done_bytes(self):
+        with self._lock:
+            return sum(r[2] for r in self.state["ranges"])
 
-    def launch_selected(self):
-        sel = self.versions_tree.selection()
-        if not sel:
-            messagebox.showinfo("Launch", "No installation selected")
+    def _fetch_range(self, rng, ranged):
+        import http.client
+        attempt = 0
+        while True:
+            start, end, done = rng
+            if end is not None and start + done > end:
+                return
+            try:
+                offset = start + done
+                with _http_open(self.url, offset if ranged or offset else None, end, self.timeout) as resp:
+                    if offset and resp.status != 206:
+                        if start:
+                            raise DownloadError("server stopped honouring Range requests")
+                        # server ignored Range: start this stream over
+                        offset = 0
+                        with self._lock:
+                            rng[2] = 0
+                    with open(self.part, "r+b") as f:
+                        f.seek(start + rng[2])
+                        if end is None and offset == 0:
+                            f.truncate()
+                        while not self._stop.is_set():
+                            want = self.chunk_size if end is None else min(self.chunk_size, end - start - rng[2] + 1)
+                            chunk = resp.read(want) if want > 0 else b""
+                            if not chunk:
+                                break
+                            f.write(chunk)
+                            with self._lock:
+                                rng[2] += len(chunk)
+                            attempt = 0
+                if self._stop.is_set():
+                    return
+                if end is None or start + rng[2] > end:
+                    return
+                raise DownloadError(f"connection closed at byte {start + rng[2]}")
+            except (OSError, http.client.HTTPException, DownloadError) as e:
+                attempt += 1
+                if attempt > self.retries or self._stop.is_set():
+                    raise DownloadError(f"{self.url}: {e}") from e
+                time.sleep(min(0.5 * 2 ** attempt, 10))
+
+    def _report(self, started, resumed_from):
+        if not self.task:
             return
-        path = self.versions_tree.item(sel[0])['values'][0]
-        found = False
-        for folder in ("2020L", "2021M"):
-            exe = os.path.join(path, folder, "ProjectXPlayerBeta.exe")
-            if os.path.isfile(exe):
-                ok, err = launch_executable(exe)
-                if ok:
-                    messagebox.showinfo("Launch", f"Launched: {os.path.basename(exe)}")
-                else:
-                    messagebox.showerror("Launch failed", err or "Unknown error")
-                found = True
-                break
-        if not found:
-            messagebox.showinfo("Launch", "No executable found inside selected installation.")
-
-    def launch_version_ui(self, folder):
-        paths = get_executable_paths(folder)
-        exe_path = None
-        for p in paths:
-            if os.path.isfile(p):
-                exe_path = p
-                break
-        if exe_path:
-            ok, err = launch_executable(exe_path)
-            if ok:
-                messagebox.showinfo("Launch", f"Launched {folder}")
-            else:
-                messagebox.showerror("Launch failed", err or "Unknown error")
+        done = self.done_bytes()
+        elapsed = max(time.perf_counter() - started, 1e-6)
+        rate = (done - resumed_from) / elapsed / (1024 * 1024)
+        total = self.state["size"]
+        size = f"{done / 1048576:.1f}/{total / 1048576:.1f} MB" if total else f"{done / 1048576:.1f} MB"
+        self.task.progress(done, total, f"Downloading {os.path.basename(self.dest)}: {size} at {rate:.2f} MB/s")
+
+    def _verify(self):
+        size = os.path.getsize(self.part)
+        expected = self.size or self.state["size"]
+        if expected is not None and size != expected:
+            raise DownloadError(f"size mismatch: got {size} bytes, expected {expected}")
+        digest = hashlib.sha256()
+        with open(self.part, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        digest = digest.hexdigest()
+        if self.sha256 and digest != self.sha256:
+            raise DownloadError(f"sha256 mismatch: got {digest}, expected {self.sha256}")
+        return size, digest
+
+    def run(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.dest)), exist_ok=True)
+        probe = _probe_download(self.url, self.timeout)
+        self.state = self._load_state(probe) or self._new_state(probe)
+        ranged = probe["ranges"]
+        resumed_from = self.done_bytes()
+        started = time.perf_counter()
+        pending = [r for r in self.state["ranges"] if r[1] is None or r[0] + r[2] <= r[1]]
+        pool = ThreadPoolExecutor(max_workers=max(1, len(pending)), thread_name_prefix="projexstrap-dl")
+        try:
+            futures = [pool.submit(self._fetch_range, r, ranged) for r in pending]
+            last_save = started
+            while not all(f.done() for f in futures):
+                if self.task and self.task.cancelled:
+                    self._stop.set()
+                    break
+                self._report(started, resumed_from)
+                if time.perf_counter() - last_save > 1:
+                    self._save_state()
+                    last_save = time.perf_counter()
+                time.sleep(0.1)
+            for future in futures:
+                future.result()
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            pool.shutdown(wait=True)
+            self._save_state()
+        if self.task:
+            self.task.check()
+        self._report(started, resumed_from)
+        try:
+            size, digest = self._verify()
+        except DownloadError:
+            # a bad file must not be resumed into again
+            for path in (self.part, self.state_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            raise
+        os.replace(self.part, self.dest)
+        try:
+            os.remove(self.state_path)
+        except OSError:
+            pass
+        seconds = time.perf_counter() - started
+        return {
+            "path": self.dest,
+            "bytes": size,
+            "resumed_from": resumed_from,
+            "parts": len(self.state["ranges"]),
+            "seconds": round(seconds, 3),
+            "mb_per_s": round((size - resumed_from) / max(seconds, 1e-6) / 1048576, 2),
+            "sha256": digest,
+        }
+
+def download_bootstrapper(task=None, settings=None):
+    settings = settings or load_settings()
+    return Download(settings.get("bootstrapper_url") or BOOTSTRAPPER_URL, BOOTSTRAPPER_FILE,
+                    sha256=settings.get("bootstrapper_sha256"), parts=settings.get("download_parts") or 1,
+                    task=task).run()
+
+def get_wine_prefix(path):
+    norm = path.replace("\\", "/")
+    idx = norm.find("/drive_c/")
+    if idx == -1:
+        return None
+    return path[:idx]
+
+def _find_window_pids(pids):
+    sys_info = get_system_info()
+    if sys_info['is_windows']:
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        found = []
+
+        @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        def callback(hwnd, lparam):
+            pid = wintypes.DWORD()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            if pid.value in pids and user32.IsWindowVisible(hwnd):
+                found.append(pid.value)
+                return False
+            return True
+        user32.EnumWindows(callback, 0)
+        return bool(found)
+    xdotool = shutil.which("xdotool")
+    if not xdotool:
+        return None
+    for pid in pids:
+        try:
+            out = subprocess.run([xdotool, "search", "--onlyvisible", "--pid", str(pid)],
+                                 stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=2).stdout
+        except Exception:
+            return None
+        if out.strip():
+            return True
+    return False
+
+def _child_pids(pid):
+    pids = [pid]
+    for p in pids:
+        try:
+            for tid in os.listdir(f"/proc/{p}/task"):
+                with open(f"/proc/{p}/task/{tid}/children") as f:
+                    pids.extend(int(c) for c in f.read().split())
+        except (OSError, ValueError):
+            pass
+    return set(pids)
+
+def parse_cpu_set(spec):
+    # "0-3,6" -> {0, 1, 2, 3, 6}
+    cpus = set()
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        if sep:
+            cpus.update(range(int(lo), int(hi) + 1))
         else:
-            messagebox.showwarning("Not Found", f"No executable found for {folder}. Searched {len(paths)} places.")
-            if messagebox.askyesno("Troubleshoot", "Open debug window to view searched paths?"):
-                self.open_debug_window()
-
-    def refresh_fastflags_view(self):
-        self.fastflags = load_fastflags_local()
-        pretty = json.dumps(self.fastflags, indent=2)
-        self.flags_preview.delete("1.0", tk.END)
-        self.flags_preview.insert(tk.END, pretty)
-
-    def open_fastflags_editor(self):
-        FastFlagsEditor(self, self.fastflags, on_save=self.on_fastflags_saved)
-
-    def on_fastflags_saved(self, new_flags):
-        self.fastflags = new_flags
-        save_fastflags_local(self.fastflags)
-        self.refresh_fastflags_view()
-        messagebox.showinfo("Saved", "FastFlags saved locally.")
-
-    def apply_fastflags_ui(self):
-        self.fastflags = load_fastflags_local()
-        if not self.fastflags:
-            messagebox.showwarning("No Flags", "No FastFlags to apply.")
-            return
-        applied, failed = apply_fastflags_to_clients(self.fastflags)
-        msg = f"Applied to {len(applied)} path(s).\n"
-        if failed:
-            msg += f"\nFailed for {len(failed)} path(s)."
-            messagebox.showwarning("Apply complete", msg)
+            cpus.add(int(lo))
+    return cpus
+
+def format_cpu_set(cpus):
+    return ",".join(str(c) for c in sorted(cpus))
+
+def _pin_windows_process(proc, cpus, nice):
+    if not cpus and not nice:
+        return
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    handle = int(proc._handle)
+    if cpus:
+        kernel32.SetProcessAffinityMask(handle, sum(1 << c for c in cpus))
+    if nice:
+        # map POSIX niceness onto the nearest priority class
+        if nice >= 10:
+            priority = 0x40    # IDLE_PRIORITY_CLASS
+        elif nice > 0:
+            priority = 0x4000  # BELOW_NORMAL_PRIORITY_CLASS
         else:
-            messagebox.showinfo("Apply complete", msg)
-        self.refresh_debug_info()
+            priority = 0x8000  # ABOVE_NORMAL_PRIORITY_CLASS
+        kernel32.SetPriorityClass(handle, priority)
 
-    def import_fastflags_from_file(self):
-        fn = filedialog.askopenfilename(title="Import FastFlags JSON", filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
-        if not fn:
-            return
+# lower rank is warmed first: the executable, then its DLLs/other
+# binaries, then everything else (content, shaders, fonts)
+_WARM_RANKS = {".exe": 0, ".dll": 1, ".drv": 1, ".ocx": 1}
+
+def warm_candidates(client_dir):
+    files = []
+    for dirpath, dirnames, filenames in os.walk(client_dir):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                continue
+            rank = 0 if name == "ProjectXPlayerBeta.exe" else _WARM_RANKS.get(os.path.splitext(name)[1].lower(), 2) + 1
+            files.append((rank, dirpath != client_dir, path, size))
+    files.sort()
+    return [(path, size) for rank, nested, path, size in files]
+
+def warm_files(files, budget_bytes, task=None):
+    # Asks the kernel to read files ahead (posix_fadvise WILLNEED returns as
+    # soon as the reads are queued); where that is missing, the files are
+    # read through once. Stops when budget_bytes have been covered.
+    started = time.perf_counter()
+    advise = getattr(os, "posix_fadvise", None)
+    buf = None if advise else bytearray(1 << 20)
+    warmed = total = 0
+    for n, (path, size) in enumerate(files):
+        if total >= budget_bytes:
+            break
+        if task:
+            task.check()
+            task.progress(n, len(files), f"Warming {os.path.basename(path)}")
+        length = min(size, budget_bytes - total)
         try:
-            with open(fn, "r") as f:
-                data = json.load(f)
-            if not isinstance(data, dict):
-                messagebox.showerror("Invalid", "JSON must be an object/dictionary")
+            with open(path, "rb", buffering=0) as f:
+                if advise:
+                    advise(f.fileno(), 0, length, os.POSIX_FADV_WILLNEED)
+                else:
+                    remaining = length
+                    while remaining > 0:
+                        read = f.readinto(buf)
+                        if not read:
+                            break
+                        remaining -= read
+        except OSError:
+            continue
+        warmed += 1
+        total += length
+    return {"files": warmed, "bytes": total, "method": "fadvise" if advise else "read",
+            "ms": round((time.perf_counter() - started) * 1000, 1)}
+
+class CacheWarmer:
+    # Remembers which client folders were warmed and when, so selecting a
+    # version, the startup pass and the launch itself don't redo the work
+    # within warm_ttl_s.
+    def __init__(self, settings=None):
+        self.settings = settings or load_settings()
+        self.warmed = {}
+        self._lock = threading.Lock()
+
+    @property
+    def budget_bytes(self):
+        return int(float(self.settings.get("warm_budget_mb") or 0) * 1024 * 1024)
+
+    def is_warm(self, client_dir):
+        with self._lock:
+            entry = self.warmed.get(os.path.abspath(client_dir))
+        return bool(entry) and time.time() - entry["time"] < float(self.settings.get("warm_ttl_s") or 0)
+
+    def warm(self, client_dir, task=None, force=False):
+        if not force and self.is_warm(client_dir):
+            return None
+        stats = warm_files(warm_candidates(client_dir), self.budget_bytes, task)
+        stats["time"] = time.time()
+        with self._lock:
+            self.warmed[os.path.abspath(client_dir)] = stats
+        return stats
+
+    def warm_version(self, version_dir, task=None):
+        return [self.warm(os.path.join(version_dir, folder), task)
+                for folder in CLIENT_FOLDERS if os.path.isdir(os.path.join(version_dir, folder))]
+
+    def warm_latest(self, task=None):
+        # the most recently updated version is the one most likely launched
+        versions = sorted(iter_version_dirs(), key=lambda v: _dir_mtime(v) or 0, reverse=True)
+        return self.warm_version(versions[0], task) if versions else []
+
+_cache_warmer = None
+
+def get_cache_warmer():
+    global _cache_warmer
+    if _cache_warmer is None:
+        _cache_warmer = CacheWarmer()
+    return _cache_warmer
+
+def launch_cache_report(path=LAUNCH_LOG_FILE):
+    # median spawn->window per cache state from the launch log: "warm"
+    # (read ahead before the click), "warming" (read ahead next to the
+    # start-up) and "off" (warm_cache disabled, the cold baseline)
+    groups = {}
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("spawn_to_window_ms") is not None:
+                    groups.setdefault(entry.get("cache") or "unknown", []).append(entry["spawn_to_window_ms"])
+    except OSError:
+        pass
+    report = {}
+    for state, values in groups.items():
+        values.sort()
+        report[state] = {"launches": len(values), "median_ms": values[len(values) // 2]}
+    return report
+
+class LaunchEngine:
+    # Resolves Wine once per prefix, keeps a warm wineserver around and
+    # records click->spawn and spawn->first window latency for every launch.
+    def __init__(self, settings=None):
+        self.settings = settings or load_settings()
+        self.timings = []
+        self.instances = []
+        self._wine = {}
+        self._env = {}
+        self._servers = {}
+        self._watchers = []
+        self._logged = set()
+        self._lock = threading.Lock()
+
+    def resolve_wine(self, prefix):
+        with self._lock:
+            if prefix in self._wine:
+                return self._wine[prefix]
+            wine_cmd = self.settings.get("wine_binary") or None
+            if not wine_cmd:
+                for candidate in ("wine64", "wine"):
+                    found = shutil.which(candidate)
+                    if not found:
+                        continue
+                    try:
+                        subprocess.check_output([found, "--version"], stderr=subprocess.DEVNULL, timeout=10)
+                    except Exception:
+                        continue
+                    wine_cmd = found
+                    break
+            self._wine[prefix] = wine_cmd or "wine"
+            return self._wine[prefix]
+
+    def launch_env(self, prefix):
+        with self._lock:
+            env = self._env.get(prefix)
+            if env is None:
+                env = os.environ.copy()
+                if get_system_info()['is_linux']:
+                    env.update({
+                        "__NV_PRIME_RENDER_OFFLOAD": "1",
+                        "__GLX_VENDOR_LIBRARY_NAME": "nvidia",
+                    })
+                if prefix:
+                    env["WINEPREFIX"] = prefix
+                self._env[prefix] = env
+            return env
+
+    def wineserver_for(self, prefix):
+        wine_cmd = self.resolve_wine(prefix)
+        sibling = os.path.join(os.path.dirname(wine_cmd), "wineserver")
+        if os.path.dirname(wine_cmd) and os.path.isfile(sibling):
+            return sibling
+        return shutil.which("wineserver")
+
+    def prestart(self, prefix):
+        if get_system_info()['is_windows'] or prefix in self._servers:
+            return False
+        server = self.wineserver_for(prefix)
+        if not server:
+            return False
+        persist = int(self.settings.get("wineserver_persist_s") or 0)
+        flag = f"-p{persist}" if persist > 0 else "-p"
+        try:
+            self._servers[prefix] = subprocess.Popen([server, flag], env=self.launch_env(prefix),
+                                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception:
+            return False
+        return True
+
+    def prestart_detected(self):
+        started = []
+        prefixes = []
+        for ver in iter_version_dirs():
+            prefix = get_wine_prefix(ver)
+            if prefix and prefix not in prefixes:
+                prefixes.append(prefix)
+        for prefix in prefixes:
+            if self.prestart(prefix):
+                started.append(prefix)
+        return started
+
+    def cache_state(self, path):
+        # "warm" when an earlier pass (startup, version selected) already
+        # covered this client, "cold" when it didn't, "off" when disabled;
+        # never touches the disk so it adds nothing to click->spawn
+        if not self.settings.get("warm_cache"):
+            return "off"
+        return "warm" if get_cache_warmer().is_warm(os.path.dirname(path)) else "cold"
+
+    def _warm_alongside(self, path, timing):
+        # a cold client is warmed next to its own start-up instead of before
+        # it; warm_ms is kept apart from the launch latencies
+        try:
+            timing["warm_ms"] = get_cache_warmer().warm(os.path.dirname(path))["ms"]
+        except (OSError, TypeError):
+            pass
+
+    def launch(self, path, clicked_at=None, prefix=None, cpus=None, nice=None, label=None, warm=True):
+        clicked_at = clicked_at or time.perf_counter()
+        cache = self.cache_state(path) if warm else "off"
+        # a cold client is read ahead while it starts, so it is logged as
+        # "warming" rather than skewing the cold numbers
+        if cache == "cold":
+            cache = "warming"
+        sys_info = get_system_info()
+        if sys_info['is_windows']:
+            proc = subprocess.Popen([path, "--app"])
+            _pin_windows_process(proc, cpus, nice)
+        else:
+            prefix = prefix or get_wine_prefix(path)
+            cmd = [self.resolve_wine(prefix), path, "--app"]
+            # taskset/nice exec the client, so the pid and every wine child
+            # inherit the CPU set and priority from the first instruction
+            if cpus and sys_info['is_linux'] and shutil.which("taskset"):
+                cmd = ["taskset", "-c", format_cpu_set(cpus)] + cmd
+            if nice and shutil.which("nice"):
+                cmd = ["nice", "-n", str(int(nice))] + cmd
+            proc = subprocess.Popen(cmd, env=self.launch_env(prefix))
+        spawned_at = time.perf_counter()
+        timing = {
+            "time": time.time(),
+            "exe": path,
+            "prefix": prefix,
+            "pid": proc.pid,
+            "wineserver_prestarted": prefix in self._servers,
+            "cache": cache,
+            "warm_ms": None,
+            "click_to_spawn_ms": round((spawned_at - clicked_at) * 1000, 1),
+            "spawn_to_window_ms": None,
+        }
+        instance = {
+            "label": label or os.path.basename(os.path.dirname(path)),
+            "exe": path,
+            "prefix": prefix,
+            "cpus": sorted(cpus) if cpus else None,
+            "nice": nice,
+            "proc": proc,
+            "spawned_at": spawned_at,
+            "timing": timing,
+        }
+        with self._lock:
+            self.timings.append(timing)
+            self.instances.append(instance)
+        if cache == "warming":
+            threading.Thread(target=self._warm_alongside, args=(path, timing), daemon=True).start()
+        watcher = threading.Thread(target=self._watch_first_window, args=(proc, spawned_at, timing), daemon=True)
+        with self._lock:
+            self._watchers.append(watcher)
+        watcher.start()
+        return proc
+
+    def running(self):
+        with self._lock:
+            return [i for i in self.instances if i["proc"].poll() is None]
+
+    def _watch_first_window(self, proc, spawned_at, timing):
+        deadline = spawned_at + float(self.settings.get("window_wait_s") or 60)
+        while time.perf_counter() < deadline and proc.poll() is None:
+            found = _find_window_pids(_child_pids(proc.pid))
+            if found is None:
+                break
+            if found:
+                timing["spawn_to_window_ms"] = round((time.perf_counter() - spawned_at) * 1000, 1)
+                break
+            time.sleep(0.25)
+        self._log_timing(timing)
+
+    def _log_timing(self, timing):
+        # every launch is written once: by its watcher, or by
+        # wait_for_windows when the process is about to exit first
+        with self._lock:
+            if id(timing) in self._logged:
                 return
-            current = load_fastflags_local()
-            current.update(data)
-            save_fastflags_local(current)
-            self.refresh_fastflags_view()
-            messagebox.showinfo("Imported", f"Imported {len(data)} flag(s).")
+            self._logged.add(id(timing))
+        try:
+            os.makedirs(os.path.dirname(LAUNCH_LOG_FILE), exist_ok=True)
+            with open(LAUNCH_LOG_FILE, "a") as f:
+                f.write(json.dumps(timing) + "\n")
+        except OSError:
+            pass
+
+    def wait_for_windows(self, timeout=None):
+        # Watchers are daemon threads, so a CLI run has to wait for them (up
+        # to window_wait_s) and then log whatever is still pending itself.
+        if timeout is None:
+            timeout = float(self.settings.get("window_wait_s") or 60)
+        deadline = time.perf_counter() + timeout
+        with self._lock:
+            watchers = list(self._watchers)
+        try:
+            for watcher in watchers:
+                watcher.join(max(0.0, deadline - time.perf_counter()))
+        finally:
+            with self._lock:
+                self._watchers = [w for w in self._watchers if w.is_alive()]
+                pending = list(self.timings)
+            for timing in pending:
+                self._log_timing(timing)
+
+def resolve_launch_spec(spec):
+    # A spec is {"folder": "2020L", "version": <version dir or its name>,
+    # "exe": <explicit path>, "prefix", "cpus": "0-3" or [0, 1], "nice", "label"};
+    # everything but folder (or exe) is optional.
+    if spec.get("exe"):
+        return spec["exe"] if os.path.isfile(spec["exe"]) else None
+    folder = spec.get("folder") or CLIENT_FOLDERS[0]
+    version = spec.get("version")
+    prefix = os.path.normpath(os.path.expanduser(spec["prefix"])) if spec.get("prefix") else None
+    for ver in iter_version_dirs():
+        if version and version not in (ver, os.path.basename(ver)):
+            continue
+        # with one install per prefix (alt accounts) the exe has to come
+        # from the prefix it will run under
+        if prefix and os.path.normpath(get_wine_prefix(ver) or "") != prefix:
+            continue
+        exe = os.path.join(ver, folder, "ProjectXPlayerBeta.exe")
+        if os.path.isfile(exe):
+            return exe
+    return None
+
+class LaunchScheduler:
+    # Starts a batch of clients with at most max_concurrent of them still
+    # starting up at once (spawned, no window yet, under start_timeout_s)
+    # and at least stagger_s between two starts, so they don't all hit the
+    # disk and shader compilation together.
+    def __init__(self, engine, max_concurrent=None, stagger_s=None, start_timeout_s=None):
+        self.engine = engine
+        settings = engine.settings
+        self.max_concurrent = max(1, int(max_concurrent or settings.get("launch_max_concurrent") or 1))
+        self.stagger_s = float(settings.get("launch_stagger_s") or 0) if stagger_s is None else float(stagger_s)
+        self.start_timeout_s = float(start_timeout_s or settings.get("launch_start_timeout_s") or 30)
+
+    def _starting(self, launched):
+        now = time.perf_counter()
+        return [i for i in launched
+                if i["timing"]["spawn_to_window_ms"] is None and i["proc"].poll() is None
+                and now - i["spawned_at"] < self.start_timeout_s]
+
+    def run(self, specs, task=None):
+        results = []
+        launched = []
+        last_start = None
+        for n, spec in enumerate(specs):
+            label = spec.get("label") or f"{spec.get('folder') or spec.get('exe')} #{n + 1}"
+            exe = resolve_launch_spec(spec)
+            if exe is None:
+                where = f" in prefix {spec['prefix']}" if spec.get("prefix") else ""
+                results.append({"label": label, "spec": spec, "ok": False, "error": f"no executable found{where}"})
+                continue
+            while True:
+                if task:
+                    task.check()
+                waiting = len(self._starting(launched)) >= self.max_concurrent
+                wait_stagger = last_start is not None and time.perf_counter() - last_start < self.stagger_s
+                if not waiting and not wait_stagger:
+                    break
+                if task:
+                    task.progress(n, len(specs), f"Waiting to start {label}")
+                time.sleep(0.2)
+            if task:
+                task.progress(n, len(specs), f"Starting {label}")
+            cpus = spec.get("cpus")
+            if isinstance(cpus, str):
+                cpus = parse_cpu_set(cpus)
+            try:
+                proc = self.engine.launch(exe, prefix=spec.get("prefix") or None, cpus=set(cpus) if cpus else None,
+                                          nice=spec.get("nice"), label=label)
+            except Exception as e:
+                results.append({"label": label, "spec": spec, "ok": False, "error": str(e)})
+                continue
+            last_start = time.perf_counter()
+            launched.append(next(i for i in reversed(self.engine.instances) if i["proc"] is proc))
+            results.append({"label": label, "spec": spec, "ok": True, "exe": exe, "pid": proc.pid})
+        return results
+
+def load_launch_batch(path):
+    with open(path, "r") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("instances", [])
+    if not isinstance(data, list) or not all(isinstance(s, dict) for s in data):
+        raise ValueError("batch must be a list of launch specs or {\"instances\": [...]}")
+    specs = []
+    for spec in data:
+        for _ in range(int(spec.get("count", 1))):
+            specs.append({k: v for k, v in spec.items() if k != "count"})
+    return specs
+
+_launch_engine = None
+
+def get_launch_engine():
+    global _launch_engine
+    if _launch_engine is None:
+        _launch_engine = LaunchEngine()
+    return _launch_engine
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+def _read_proc_stats(pid):
+    # utime+stime ticks, thread count, RSS bytes and I/O bytes for one pid;
+    # None once the process is gone. /proc/<pid>/io needs the same user.
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rpartition(")")[2].split()
+        stats = {"ticks": int(fields[11]) + int(fields[12]), "threads": int(fields[17]),
+                 "rss": int(fields[21]) * _PAGE_SIZE, "read_bytes": None, "write_bytes": None}
+    except (OSError, ValueError, IndexError):
+        return None
+    try:
+        with open(f"/proc/{pid}/io") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("read_bytes", "write_bytes"):
+                    stats[key] = int(value)
+    except (OSError, ValueError):
+        pass
+    return stats
+
+class ProcessSupervisor:
+    # Samples every instance the launch engine started, plus its process
+    # tree, from /proc every telemetry_interval_s. Each sample becomes the
+    # instance's "stats" and a line in a size-capped JSON-lines log (the
+    # previous log is kept as .1). Without /proc only uptime and exit code
+    # are recorded.
+    def __init__(self, engine, log_path=TELEMETRY_LOG_FILE):
+        self.engine = engine
+        self.log_path = log_path
+        self.interval_s = max(0.2, float(engine.settings.get("telemetry_interval_s") or 2))
+        self.log_max_bytes = int(engine.settings.get("telemetry_log_max_kb") or 2048) * 1024
+        self.has_proc = os.path.isdir("/proc/self")
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="projexstrap-supervisor", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval_s):
+            self.sample()
+
+    def active(self):
+        return [i for i in self.engine.instances if i.get("exit_code") is None]
+
+    def sample(self):
+        with self._lock:
+            records = [self._sample_instance(i) for i in self.active()]
+        if records:
+            self._log(records)
+        return records
+
+    def _sample_instance(self, instance):
+        proc = instance["proc"]
+        now = time.perf_counter()
+        if "flags_sha256" not in instance:
+            instance["flags_sha256"] = _serialize_flags(get_flag_store().snapshot())[1]
+        record = {
+            "time": time.time(),
+            "label": instance["label"],
+            "pid": proc.pid,
+            "exe": instance["exe"],
+            "prefix": instance["prefix"],
+            "flags_sha256": instance["flags_sha256"],
+            "uptime_s": round(now - instance["spawned_at"], 1),
+            "exit_code": proc.poll(),
+        }
+        if record["exit_code"] is not None:
+            instance["exit_code"] = record["exit_code"]
+        elif self.has_proc:
+            totals = {"ticks": 0, "threads": 0, "rss": 0, "read_bytes": 0, "write_bytes": 0, "procs": 0}
+            for pid in _child_pids(proc.pid):
+                stats = _read_proc_stats(pid)
+                if stats is None:
+                    continue
+                totals["procs"] += 1
+                for key in ("ticks", "threads", "rss", "read_bytes", "write_bytes"):
+                    if stats[key] is None or totals[key] is None:
+                        totals[key] = None
+                    else:
+                        totals[key] += stats[key]
+            last = instance.get("_last_sample")
+            cpu = None
+            if last and now > last[0]:
+                cpu = round(max(0, totals["ticks"] - last[1]) / _CLK_TCK / (now - last[0]) * 100, 1)
+            instance["_last_sample"] = (now, totals["ticks"])
+            record.update({
+                "procs": totals["procs"],
+                "cpu_pct": cpu,
+                "rss_mb": round(totals["rss"] / 1048576, 1),
+                "threads": totals["threads"],
+                "read_bytes": totals["read_bytes"],
+                "write_bytes": totals["write_bytes"],
+            })
+        instance["stats"] = record
+        return record
+
+    def _log(self, records):
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            try:
+                if os.path.getsize(self.log_path) > self.log_max_bytes:
+                    os.replace(self.log_path, self.log_path + ".1")
+            except OSError:
+                pass
+            with open(self.log_path, "a") as f:
+                f.writelines(json.dumps(r) + "\n" for r in records)
+        except OSError:
+            pass
+
+_supervisor = None
+
+def get_supervisor():
+    global _supervisor
+    if _supervisor is None:
+        _supervisor = ProcessSupervisor(get_launch_engine())
+    return _supervisor
+
+def format_stats(stats):
+    if stats.get("exit_code") is not None:
+        return f"exited {stats['exit_code']} after {stats['uptime_s']} s"
+    if "cpu_pct" not in stats:
+        return f"running {stats['uptime_s']} s"
+    cpu = "-" if stats["cpu_pct"] is None else f"{stats['cpu_pct']}%"
+    io = ""
+    if stats["read_bytes"] is not None:
+        io = f", io r {stats['read_bytes'] / 1048576:.1f} MB w {stats['write_bytes'] / 1048576:.1f} MB"
+    return (f"cpu {cpu}, rss {stats['rss_mb']} MB, {stats['threads']} threads in {stats['procs']} proc(s)"
+            f"{io}, up {stats['uptime_s']} s")
+
+def launch_executable(path, clicked_at=None):
+    try:
+        get_launch_engine().launch(path, clicked_at=clicked_at)
+        return True, None
+    except Exception as e:
+        return False, str(e)
+
+
+def _file_info(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {"path": path, "exists": False}
+    return {"path": path, "exists": True, "size": st.st_size, "mtime": st.st_mtime}
+
+def collect_diagnostics(force=False, task=None):
+    # One pass over everything the Debug views show. Each phase is timed so a
+    # slow prefix (network home, huge bottle) stands out in the snapshot.
+    phases = {}
+    snapshot = {"time": time.time(), "phases": phases}
+
+    def phase(name, fn):
+        if task:
+            task.check()
+            task.progress(len(phases), 8, f"Collecting {name}")
+        started = time.perf_counter()
+        try:
+            snapshot[name] = fn()
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to import: {e}")
+            snapshot[name] = {"error": str(e)}
+        phases[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    phase("system", lambda: {
+        "os": f"{platform.system()} {platform.release()}",
+        "arch": platform.machine(),
+        "python": sys.version.split()[0],
+        "cpus": os.cpu_count(),
+        "cwd": os.getcwd(),
+    })
+
+    def prefixes():
+        discovery = get_prefix_discovery()
+        discovery.roots(force=force)
+        return {"ms": discovery.ms, "prefixes": list(discovery.report)}
+    phase("discovery", prefixes)
+
+    def roots():
+        index = get_install_index(force=force)
+        return [{"path": root, "exists": entry.get("mtime") is not None,
+                 "versions": len(entry.get("versions", {})), "ms": index.timings.get(root)}
+                for root, entry in index.roots.items()]
+    phase("roots", roots)
+
+    def targets():
+        state = load_applied_state()
+        result = []
+        for client_dir, settings_path, folder in get_clientsettings_targets():
+            info = _file_info(settings_path)
+            info["folder"] = folder
+            known = state.get(settings_path)
+            signature = _stat_signature(settings_path)
+            info["applied"] = bool(known and signature and known[1:] == signature)
+            result.append(info)
+        return result
+    phase("targets", targets)
+
+    def fastflags():
+        info = _file_info(FASTFLAGS_FILE)
+        info["count"] = len(get_flag_store().snapshot())
+        return info
+    phase("fastflags", fastflags)
+    phase("catalog", lambda: {"path": CATALOG_FILE, "count": get_flag_catalog().count()})
+    phase("bootstrapper", lambda: _file_info(BOOTSTRAPPER_FILE))
+
+    def backups():
+        points = get_backup_store().points()
+        return {"path": BACKUP_DIR, "points": len(points), "latest": points[0]["time"] if points else None}
+    phase("backups", backups)
+    snapshot["launches"] = list(get_launch_engine().timings[-5:])
+    snapshot["startup"] = dict(get_startup_timeline().marks)
+    snapshot["total_ms"] = round(sum(phases.values()), 2)
+    return snapshot
+
+def _ms(value):
+    return "n/a" if value is None else f"{value} ms"
 
-    def refresh_bs_status(self):
-        if os.path.exists(BOOTSTRAPPER_FILE):
-            size_mb = os.path.getsize(BOOTSTRAPPER_FILE) / (1024 * 1024)
-            self.bs_status.config(text=f"Found: {BOOTSTRAPPER_FILE} ({size_mb:.1f} MB)", foreground=self.fg)
+def format_diagnostics(snapshot):
+    lines = []
+    system = snapshot.get("system", {})
+    lines.append(f"OS: {system.get('os')}")
+    lines.append(f"Arch: {system.get('arch')}")
+    lines.append(f"Python: {system.get('python')}")
+    lines.append("")
+    discovery = snapshot.get("discovery") or {}
+    lines.append(f"Wine prefixes found ({_ms(discovery.get('ms'))}):")
+    if not discovery.get("prefixes"):
+        lines.append("  None found")
+    for entry in discovery.get("prefixes") or []:
+        state = "timed out" if entry["timed_out"] else f"{len(entry['roots'])} install(s)"
+        lines.append(f" - [{entry['source']}] {entry['prefix']} ({state}, {_ms(entry['ms'])})")
+    lines.append("")
+    lines.append("Installation roots checked:")
+    for root in snapshot.get("roots") or []:
+        found = f"{root['versions']} version(s)" if root["exists"] else "missing"
+        lines.append(f" - {root['path']} ({found}, {_ms(root['ms'])})")
+    lines.append("")
+    lines.append("ClientSettings Targets:")
+    targets = snapshot.get("targets") or []
+    if not targets:
+        lines.append("  None found")
+    for target in targets:
+        mark = "✓" if target["exists"] else "✗"
+        applied = ", applied" if target.get("applied") else ""
+        size = f" ({target['size']} bytes{applied})" if target["exists"] else ""
+        lines.append(f" {mark} {target['folder']}: {target['path']}{size}")
+    lines.append("")
+    flags = snapshot.get("fastflags", {})
+    lines.append("Local FastFlags file:")
+    lines.append(f" - {flags.get('path')} (exists: {flags.get('exists')}, {flags.get('count', 0)} flag(s))")
+    lines.append("")
+    lines.append("FFlag catalog:")
+    lines.append(f" - {snapshot.get('catalog', {}).get('path')} ({snapshot.get('catalog', {}).get('count')} flag(s))")
+    lines.append("")
+    bs = snapshot.get("bootstrapper", {})
+    lines.append("Bootstrapper:")
+    size = f", {bs['size'] / (1024 * 1024):.1f} MB" if bs.get("exists") else ""
+    lines.append(f" - {bs.get('path')} (exists: {bs.get('exists')}{size})")
+    lines.append("")
+    backups = snapshot.get("backups", {})
+    lines.append("Backups:")
+    lines.append(f" - {backups.get('path')} ({backups.get('points', 0)} restore point(s))")
+    lines.append("")
+    lines.append("Recent launches:")
+    if not snapshot.get("launches"):
+        lines.append("  None this session")
+    for t in snapshot.get("launches") or []:
+        lines.append(f" - {t['exe']}: click->spawn {t['click_to_spawn_ms']} ms, spawn->window {_ms(t['spawn_to_window_ms'])}"
+                     f", cache {t.get('cache', 'n/a')}")
+    if snapshot.get("startup"):
+        lines.append("")
+        lines.append("Startup (ms since process start):")
+        lines.append(" - " + ", ".join(f"{name} {ms}" for name, ms in snapshot["startup"].items()))
+    lines.append("")
+    lines.append(f"Collected in {snapshot.get('total_ms')} ms: "
+                 + ", ".join(f"{name} {ms}" for name, ms in snapshot.get("phases", {}).items()))
+    return lines
+
+def export_diagnostics(path, snapshot=None):
+    snapshot = snapshot or collect_diagnostics()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    atomic_write(path, json.dumps(snapshot, indent=2, default=str).encode("utf-8"))
+    return path
+
+def cli_list(args):
+    versions = list(iter_version_dirs(force=args.rescan))
+    if not versions:
+        print("No installations found")
+        return 1
+    for ver in versions:
+        print(ver)
+    for client_dir, settings_path, folder in get_clientsettings_targets():
+        print(f"  {folder}: {settings_path}")
+    return 0
+
+def cli_apply(args):
+    if args.flags:
+        try:
+            with open(args.flags, "r") as f:
+                fastflags = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Failed to read {args.flags}: {e}", file=sys.stderr)
+            return 1
+        if not isinstance(fastflags, dict):
+            print("JSON must be an object/dictionary", file=sys.stderr)
+            return 1
+    else:
+        fastflags = get_flag_store().snapshot()
+    if not fastflags:
+        print("No FastFlags to apply.", file=sys.stderr)
+        return 1
+    get_install_index(force=args.rescan)
+    issues = get_flag_catalog().validate(fastflags, versions=get_installed_client_folders())
+    if issues:
+        print(f"{len(issues)} flag(s) failed catalog validation:", file=sys.stderr)
+        print(format_flag_issues(issues, limit=len(issues)), file=sys.stderr)
+        if args.strict:
+            return 1
+    report = apply_local_flags(fastflags)
+    for result in report:
+        line = f"{result['status']}: {result['folder']}: {result['path']} ({result['ms']} ms)"
+        if result["status"] == "failed":
+            print(f"{line}: {result['error']}", file=sys.stderr)
         else:
-            self.bs_status.config(text=f"Not found: {BOOTSTRAPPER_FILE}", foreground=self.warn)
+            print(line)
+    counts = summarize_apply(report)
+    print(f"Written {counts['written']}, unchanged {counts['skipped']}, failed {counts['failed']}.")
+    return 1 if counts["failed"] or not report else 0
 
-    def refresh_debug_info(self):
-        self.debug_text.delete("1.0", tk.END)
-        sys_info = get_system_info()
-        self.debug_text.insert(tk.END, f"OS: {platform.system()} {platform.release()}\n")
-        self.debug_text.insert(tk.END, f"Arch: {platform.machine()}\n")
-        self.debug_text.insert(tk.END, f"Python: {sys.version.split()[0]}\n\n")
-        self.debug_text.insert(tk.END, "Installation roots checked:\n")
-        for r in get_version_roots():
-            self.debug_text.insert(tk.END, f" - {r}\n")
-        self.debug_text.insert(tk.END, "\nClientSettings Targets:\n")
-        targets = get_clientsettings_targets()
-        if not targets:
-            self.debug_text.insert(tk.END, "  None found\n")
+def cli_import(args):
+    try:
+        merged, report = import_fastflags_files(args.paths, policy=args.policy, dry_run=args.dry_run)
+    except MergeConflictError as e:
+        print(format_merge_report(e.report, limit=len(e.report["conflicts"])), file=sys.stderr)
+        print("Nothing written.", file=sys.stderr)
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"Failed to import: {e}", file=sys.stderr)
+        return 1
+    print(format_merge_report(report, limit=len(report["conflicts"])))
+    if args.dry_run:
+        print("Dry run, nothing written.")
+    elif report["changed"]:
+        print(f"Wrote {len(merged)} flag(s) to {FASTFLAGS_FILE}.")
+    return 0
+
+def cli_download(args):
+    settings = load_settings()
+    if args.url:
+        settings["bootstrapper_url"] = args.url
+    if args.sha256:
+        settings["bootstrapper_sha256"] = args.sha256
+    if args.parts:
+        settings["download_parts"] = args.parts
+    try:
+        result = download_bootstrapper(settings=settings)
+    except (OSError, DownloadError) as e:
+        print(f"Download failed: {e}", file=sys.stderr)
+        return 1
+    resumed = f", resumed at {result['resumed_from']} bytes" if result["resumed_from"] else ""
+    print(f"{result['path']}: {result['bytes']} bytes in {result['seconds']} s ({result['mb_per_s']} MB/s, "
+          f"{result['parts']} part(s){resumed})")
+    print(f"sha256 {result['sha256']}")
+    return 0
+
+def cli_profile(args):
+    manager = get_profile_manager()
+    try:
+        if args.action == "list":
+            active = load_settings().get("active_profile")
+            for name in manager.names():
+                doc = manager.load(name)[0]
+                base = doc.get("base") or "local flags"
+                print(f"{'*' if name == active else ' '} {name} (base: {base}, {len(doc['flags'])} flag(s), "
+                      f"folders: {', '.join(sorted(doc['folders'])) or '-'})")
+            return 0
+        if not args.name:
+            print("A profile name is required.", file=sys.stderr)
+            return 1
+        if args.action == "create":
+            doc = {"flags": {}, "folders": {}}
+            if args.base:
+                doc["base"] = args.base
+            if args.flags:
+                doc["flags"] = dict(iter_flags_json(args.flags))
+            if args.folder and args.folder_flags:
+                doc["folders"][args.folder] = dict(iter_flags_json(args.folder_flags))
+            manager.save(args.name, doc)
+            print(f"Saved profile {args.name}.")
+            return 0
+        if args.action == "show":
+            print(json.dumps(manager.view(args.name, args.folder), indent=2))
+            return 0
+        get_install_index(force=args.rescan)
+        report = apply_profile(args.name)
+    except (KeyError, ValueError, OSError) as e:
+        print(f"Profile error: {e}", file=sys.stderr)
+        return 1
+    counts = summarize_apply(report)
+    for result in report:
+        if result["status"] != "skipped":
+            print(f"{result['status']}: {result['folder']}: {result['path']}")
+    print(f"Profile {args.name}: written {counts['written']}, unchanged {counts['skipped']}, failed {counts['failed']}.")
+    return 1 if counts["failed"] else 0
+
+def cli_watch(args):
+    get_install_index(force=args.rescan)
+    watcher = FlagWatcher(use_inotify=False if args.poll else None)
+    mode = "inotify" if watcher.use_inotify else f"polling every {watcher.poll_s:g} s"
+    print(f"Watching {len(watcher.watch_paths())} path(s) ({mode}); Ctrl-C to stop.")
+    watcher.start()
+    seen = 0
+    try:
+        while watcher.running:
+            time.sleep(0.5)
+            if watcher.applies != seen:
+                seen = watcher.applies
+                if watcher.last_error:
+                    print(f"Re-apply failed: {watcher.last_error}", file=sys.stderr)
+                else:
+                    counts = summarize_apply(watcher.last_report or [])
+                    print(f"{time.strftime('%H:%M:%S')} re-applied: written {counts['written']}, "
+                          f"unchanged {counts['skipped']}, failed {counts['failed']}")
+    except KeyboardInterrupt:
+        watcher.stop()
+    return 0
+
+def cli_backups(args):
+    store = get_backup_store()
+    if args.action == "list":
+        points = store.points()
+        if not points:
+            print("No backups yet.")
+        for n, point in enumerate(points, 1):
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(point["time"]))
+            print(f"{n:>3}  {stamp}  {point['time']:.3f}  {point['targets']} target(s)  {'/'.join(sorted(point['kinds']))}")
+        return 0
+    if args.action == "prune":
+        removed = store.prune()
+        store.commit(force=True)
+        print(f"Removed {removed} unreferenced object(s).")
+        return 0
+    try:
+        when = resolve_backup_point(args.point or "previous", store)
+    except ValueError as e:
+        print(f"Bad point: {e}", file=sys.stderr)
+        return 1
+    report = rollback_clients(when, targets=args.target or None)
+    counts = summarize_apply(report)
+    for result in report:
+        if result["status"] != "skipped" or result["error"]:
+            print(f"{result['status']}: {result['path']}{': ' + result['error'] if result['error'] else ''}")
+    print(f"Restored {counts['written']}, unchanged {counts['skipped']}, failed {counts['failed']}.")
+    return 1 if counts["failed"] else 0
+
+def cli_launch(args):
+    get_install_index(force=args.rescan)
+    if args.batch:
+        try:
+            specs = load_launch_batch(args.batch)
+        except (OSError, ValueError) as e:
+            print(f"Failed to read {args.batch}: {e}", file=sys.stderr)
+            return 1
+    elif args.folder:
+        spec = {"folder": args.folder, "version": args.version, "prefix": args.prefix,
+                "cpus": args.cpus, "nice": args.nice}
+        specs = [dict(spec) for _ in range(max(1, args.count))]
+    else:
+        print("Give a client folder or --batch FILE.", file=sys.stderr)
+        return 1
+    scheduler = LaunchScheduler(get_launch_engine(), max_concurrent=args.max_concurrent, stagger_s=args.stagger)
+    failed = 0
+    for result in scheduler.run(specs):
+        if result["ok"]:
+            print(f"Launched {result['label']}: {result['exe']} (pid {result['pid']})")
         else:
-            for client_dir, settings_path, folder in targets:
-                exists = os.path.exists(settings_path)
-                marker = "✓" if exists else "✗"
-                self.debug_text.insert(tk.END, f" {marker} {folder}: {settings_path}\n")
-        self.refresh_bs_status()
-
-    def open_debug_window(self):
-        DebugWindow(self)
-
-class FastFlagsEditor(tk.Toplevel):
-    def __init__(self, parent, flags, on_save=None):
-        super().__init__(parent)
-        self.title("FastFlags Editor")
-        self.geometry("720x520")
-        self.configure(bg=parent.bg)
-        self.parent = parent
-        self.on_save = on_save
-        self.flags = dict(flags or {})
-        self._build_ui()
-
-    def _build_ui(self):
-        padx = 12
-        pady = 10
-        frame = ttk.Frame(self, style="Card.TFrame")
-        frame.pack(fill="both", expand=True, padx=16, pady=16)
-        left = ttk.Frame(frame, style="Card.TFrame")
-        left.pack(side="left", fill="y", padx=(8,12), pady=8)
-        ttk.Label(left, text="Flags", style="Sub.TLabel").pack(anchor="w", padx=8, pady=(6,6))
-        self.listbox = tk.Listbox(left, width=38, height=20, bg=self.parent.card, fg=self.parent.fg, bd=0, highlightthickness=0)
-        self.listbox.pack(padx=6, pady=(0,6))
-        self.listbox.bind("<<ListboxSelect>>", self.on_select)
-
-        right = ttk.Frame(frame, style="Card.TFrame")
-        right.pack(side="left", fill="both", expand=True, padx=(0,8), pady=8)
-
-        ttk.Label(right, text="Key", style="Sub.TLabel").pack(anchor="w", padx=8, pady=(6,0))
-        self.entry_key = ttk.Entry(right)
-        self.entry_key.pack(fill="x", padx=8, pady=(0,8))
-
-        ttk.Label(right, text="Value", style="Sub.TLabel").pack(anchor="w", padx=8, pady=(6,0))
-        self.entry_value = ttk.Entry(right)
-        self.entry_value.pack(fill="x", padx=8, pady=(0,8))
-
-        btnf = ttk.Frame(right, style="TFrame")
-        btnf.pack(anchor="e", pady=8, padx=8)
-        ttk.Button(btnf, text="Add / Update", command=self.add_or_update).pack(side="left", padx=6)
-        ttk.Button(btnf, text="Remove", command=self.remove_selected).pack(side="left", padx=6)
-        ttk.Button(btnf, text="Import JSON", command=self.import_json).pack(side="left", padx=6)
-
-        bottom = ttk.Frame(right, style="TFrame")
-        bottom.pack(fill="x", padx=8, pady=(12,8))
-        ttk.Button(bottom, text="Save & Close", command=self.save_and_close).pack(side="right")
-
-        self.populate_list()
-
-    def populate_list(self):
-        self.listbox.delete(0, tk.END)
-        keys = sorted(self.flags.keys())
-        for k in keys:
-            v = self.flags[k]
-            self.listbox.insert(tk.END, f"{k} = {v}")
-
-    def on_select(self, evt=None):
-        sel = self.listbox.curselection()
-        if not sel: return
-        idx = sel[0]
-        text = self.listbox.get(idx)
-        if " = " in text:
-            k, v = text.split(" = ", 1)
-            self.entry_key.delete(0, tk.END)
-            self.entry_key.insert(0, k)
-            self.entry_value.delete(0, tk.END)
-            self.entry_value.insert(0, str(v))
-
-    def add_or_update(self):
-        k = self.entry_key.get().strip()
-        v_raw = self.entry_value.get().strip()
-        if not k:
-            messagebox.showerror("Error", "Key cannot be empty")
-            return
-        val = auto_detect_value_type(v_raw)
-        self.flags[k] = val
-        self.populate_list()
-
-    def remove_selected(self):
-        k = self.entry_key.get().strip()
-        if not k:
-            messagebox.showwarning("Remove", "No key provided")
-            return
-        if k in self.flags:
-            del self.flags[k]
-            self.populate_list()
-            self.entry_key.delete(0, tk.END)
-            self.entry_value.delete(0, tk.END)
+            failed += 1
+            print(f"Launch failed for {result['label']}: {result['error']}", file=sys.stderr)
+    if args.watch:
+        supervisor = get_supervisor()
+        try:
+            while supervisor.active():
+                time.sleep(supervisor.interval_s)
+                for stats in supervisor.sample():
+                    print(f"{stats['label']} (pid {stats['pid']}): {format_stats(stats)}")
+        except KeyboardInterrupt:
+            pass
+    engine = get_launch_engine()
+    if engine.running() and not args.no_wait and not args.watch:
+        print(f"Waiting up to {engine.settings.get('window_wait_s') or 60} s for the first window (Ctrl+C to stop waiting)...")
+    try:
+        engine.wait_for_windows(0 if args.no_wait or args.watch else None)
+    except KeyboardInterrupt:
+        engine.wait_for_windows(0)
+    return 1 if failed else 0
+
+def cli_warm(args):
+    if args.report:
+        report = launch_cache_report()
+        if not report:
+            print("No launches with a recorded first window yet.")
+        for state, entry in sorted(report.items()):
+            print(f"{state:<8} {entry['launches']:>4} launch(es), median spawn->window {entry['median_ms']} ms")
+        return 0
+    get_install_index(force=args.rescan)
+    warmer = get_cache_warmer()
+    versions = [v for v in iter_version_dirs() if not args.version or args.version in (v, os.path.basename(v))]
+    if not args.version:
+        versions = sorted(versions, key=lambda v: _dir_mtime(v) or 0, reverse=True)[:1]
+    if not versions:
+        print("No matching installation found.", file=sys.stderr)
+        return 1
+    for ver in versions:
+        folders = [args.folder] if args.folder else CLIENT_FOLDERS
+        for folder in folders:
+            client_dir = os.path.join(ver, folder)
+            if not os.path.isdir(client_dir):
+                continue
+            stats = warmer.warm(client_dir, force=True)
+            print(f"{client_dir}: {stats['files']} file(s), {stats['bytes'] / (1024 * 1024):.1f} MB "
+                  f"via {stats['method']} in {stats['ms']} ms")
+    return 0
+
+def cli_prefixes(args):
+    discovery = get_prefix_discovery()
+    discovery.roots(force=True)
+    if not discovery.report:
+        print("No Wine prefixes found. Add folders to prefix_roots in the settings file or set WINEPREFIX.")
+        return 1
+    for entry in sorted(discovery.report, key=lambda e: -(e["ms"] or 0) if args.slowest else 0):
+        state = "timed out" if entry["timed_out"] else f"{len(entry['roots'])} install(s)"
+        print(f"{_ms(entry['ms']):>10}  [{entry['source']}] {entry['prefix']} ({state})")
+        for root in entry["roots"]:
+            print(f"            {root}")
+    print(f"Discovered {len(discovery.report)} prefix(es) in {discovery.ms} ms")
+    return 0
+
+def cli_usage(args):
+    get_install_index(force=args.rescan)
+    result = analyze_installations(duplicates=not args.no_duplicates)
+    if not result["versions"]:
+        print("No installations found")
+        return 1
+    for root, totals in sorted(result["roots"].items()):
+        print(f"{format_size(totals['bytes']):>10}  {root} ({totals['versions']} version(s))")
+        for v in sorted((v for v in result["versions"] if v["root"] == root), key=lambda v: v["mtime"], reverse=True):
+            mark = " running" if v["running"] else " stale" if v["stale"] else ""
+            print(f"{format_size(v['bytes']):>10}    {os.path.basename(v['path'])} ({v['files']} file(s)){mark}")
+    stale = [v for v in result["versions"] if v["stale"]]
+    print(f"Stale versions: {len(stale)}, {format_size(sum(v['bytes'] for v in stale))}")
+    if not args.no_duplicates:
+        print(f"Duplicate files: {len(result['duplicates'])} group(s), "
+              f"{format_size(result['reclaimable'])} reclaimable by hard-linking")
+        for group in result["duplicates"][:args.limit]:
+            print(f"  {format_size(group['bytes'])} x{len(group['paths'])}  {os.path.basename(group['paths'][0])}")
+    print(f"Scanned in {result['ms']} ms")
+    status = 0
+    if args.prune_stale and stale:
+        if args.yes or input(f"Remove {len(stale)} stale version(s)? [y/N] ").strip().lower() == "y":
+            for r in prune_versions([v["path"] for v in stale]):
+                print(f"{r['status']}: {r['path']}{': ' + r['error'] if r['error'] else ''}")
+                status = 1 if r["status"] == "failed" else status
+    if args.link and result["duplicates"]:
+        if args.yes or input(f"Hard-link {format_size(result['reclaimable'])} of duplicates? [y/N] ").strip().lower() == "y":
+            linked = link_duplicates(result["duplicates"])
+            print(f"Linked {linked['linked']} file(s), reclaimed {format_size(linked['bytes'])}")
+            for error in linked["errors"]:
+                print(f"  {error}", file=sys.stderr)
+            status = 1 if linked["errors"] else status
+    return status
+
+def cli_diag(args):
+    snapshot = collect_diagnostics(force=args.rescan)
+    if args.json:
+        if args.json == "-":
+            print(json.dumps(snapshot, indent=2, default=str))
         else:
-            messagebox.showinfo("Remove", "Key not found")
+            print(f"Wrote {export_diagnostics(args.json, snapshot)}")
+        return 0
+    print("\n".join(format_diagnostics(snapshot)))
+    return 0
 
-    def import_json(self):
-        fn = filedialog.askopenfilename(title="Import FastFlags JSON", filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
-        if not fn:
-            return
+def cli_catalog(args):
+    catalog = get_flag_catalog()
+    if args.action == "import":
+        versions = [v for v in (args.versions or "").split(",") if v]
+        for path in args.args:
+            try:
+                count = catalog.import_file(path, versions)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Failed to import {path}: {e}", file=sys.stderr)
+                return 1
+            print(f"{path}: {count} flag(s)")
+        print(f"Catalog holds {catalog.count()} flag(s).")
+        return 0
+    if args.action == "search":
+        for entry in catalog.search(" ".join(args.args), limit=args.limit):
+            versions = ",".join(entry["versions"]) or "-"
+            print(f"{entry['name']}\t{entry['type']}\t{versions}\t{json.dumps(entry['default'])}")
+        return 0
+    flags = {} if args.args else get_flag_store().snapshot()
+    for path in args.args:
         try:
-            with open(fn, "r") as f:
+            with open(path, "r") as f:
                 data = json.load(f)
-            if not isinstance(data, dict):
-                messagebox.showerror("Invalid", "JSON must be an object/dictionary")
-                return
-            self.flags.update(data)
-            self.populate_list()
-            messagebox.showinfo("Imported", f"Imported {len(data)} flag(s).")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to import: {e}")
-
-    def save_and_close(self):
-        if self.on_save:
-            self.on_save(self.flags)
-        self.destroy()
-
-class DebugWindow(tk.Toplevel):
-    def __init__(self, parent):
-        super().__init__(parent)
-        self.title("Debug Information")
-        self.geometry("820x520")
-        self.configure(bg=parent.bg)
-        txt = tk.Text(self, bg=parent.card, fg=parent.fg, bd=0, padx=10, pady=8)
-        txt.pack(fill="both", expand=True, padx=16, pady=16)
-        sys_info = get_system_info()
-        lines = []
-        lines.append(f"OS: {platform.system()} {platform.release()}")
-        lines.append(f"Arch: {platform.machine()}")
-        lines.append(f"Python: {sys.version.split()[0]}")
-        lines.append("")
-        lines.append("Installation roots checked:")
-        for r in get_version_roots():
-            lines.append(f" - {r}")
-        lines.append("")
-        lines.append("ClientSettings Targets:")
-        targets = get_clientsettings_targets()
-        if not targets:
-            lines.append("  None found")
-        else:
-            for client_dir, settings_path, folder in targets:
-                exists = os.path.exists(settings_path)
-                mark = "✓" if exists else "✗"
-                lines.append(f" {mark} {folder}: {settings_path}")
-        lines.append("")
-        lines.append("Local FastFlags file:")
-        lines.append(f" - {FASTFLAGS_FILE} (exists: {os.path.exists(FASTFLAGS_FILE)})")
-        lines.append("")
-        lines.append("Bootstrapper:")
-        lines.append(f" - {BOOTSTRAPPER_FILE} (exists: {os.path.exists(BOOTSTRAPPER_FILE)})")
-        txt.insert("1.0", "\n".join(lines))
-        txt.configure(state="disabled")
+        except (OSError, ValueError) as e:
+            print(f"Failed to read {path}: {e}", file=sys.stderr)
+            return 1
+        if not isinstance(data, dict):
+            print(f"{path}: JSON must be an object/dictionary", file=sys.stderr)
+            return 1
+        flags.update(data)
+    issues = catalog.validate(flags)
+    if issues:
+        print(format_flag_issues(issues, limit=len(issues)))
+        return 1
+    print(f"{len(flags)} flag(s) OK against {catalog.count()} catalog entries.")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="projexstrap", description="Korone bootstrapper. Run without a command to open the GUI.")
+    parser.add_argument("--rescan", action="store_true", help="ignore the cached installation index")
+    parser.add_argument("--timing", action="store_true", help="print startup and command time to stderr")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("list", help="list detected installations and ClientSettings targets").set_defaults(func=cli_list)
+    p_apply = sub.add_parser("apply", help="write FastFlags to every detected client")
+    p_apply.add_argument("--flags", metavar="JSON", help=f"flags file to apply (default: {FASTFLAGS_FILE})")
+    p_apply.add_argument("--strict", action="store_true", help="refuse to apply flags that fail catalog validation")
+    p_apply.set_defaults(func=cli_apply)
+    p_import = sub.add_parser("import", help="merge FastFlags JSON files or folders into the local flags")
+    p_import.add_argument("paths", nargs="+", metavar="PATH")
+    p_import.add_argument("--policy", choices=MERGE_POLICIES, default="last-wins")
+    p_import.add_argument("--dry-run", action="store_true", help="only print the merge report")
+    p_import.set_defaults(func=cli_import)
+    p_profile = sub.add_parser("profile", help="manage and switch layered flag profiles")
+    p_profile.add_argument("action", choices=("list", "show", "create", "apply"))
+    p_profile.add_argument("name", nargs="?")
+    p_profile.add_argument("--base", help="profile to inherit from (default: the local FastFlags)")
+    p_profile.add_argument("--flags", metavar="JSON", help="override layer for create")
+    p_profile.add_argument("--folder", choices=CLIENT_FOLDERS, help="client folder for show, or for --folder-flags")
+    p_profile.add_argument("--folder-flags", metavar="JSON", help="per-folder override layer for create")
+    p_profile.set_defaults(func=cli_profile)
+    p_watch = sub.add_parser("watch", help="keep flags applied when client updates overwrite them")
+    p_watch.add_argument("--poll", action="store_true", help="use mtime polling even where inotify is available")
+    p_watch.set_defaults(func=cli_watch)
+    p_backups = sub.add_parser("backups", help="list, prune or roll back ClientAppSettings backups")
+    p_backups.add_argument("action", choices=("list", "rollback", "prune"))
+    p_backups.add_argument("point", nargs="?", help="'previous', a number from 'backups list', or a Unix time")
+    p_backups.add_argument("--target", action="append", help="only restore this settings file (repeatable)")
+    p_backups.set_defaults(func=cli_backups)
+    p_launch = sub.add_parser("launch", help="launch one or more clients")
+    p_launch.add_argument("folder", nargs="?", choices=CLIENT_FOLDERS)
+    p_launch.add_argument("--version", help="version folder (name or path) to launch from")
+    p_launch.add_argument("--prefix", help="Wine prefix to run in")
+    p_launch.add_argument("--count", type=int, default=1, help="number of instances")
+    p_launch.add_argument("--cpus", help="CPU set to pin to, e.g. 0-3,6")
+    p_launch.add_argument("--nice", type=int, help="niceness for the client")
+    p_launch.add_argument("--batch", metavar="JSON", help="list of launch specs (folder, version, prefix, cpus, nice, label, count)")
+    p_launch.add_argument("--max-concurrent", type=int, help="instances allowed to be starting up at once")
+    p_launch.add_argument("--stagger", type=float, help="minimum seconds between two starts")
+    p_launch.add_argument("--watch", action="store_true", help=f"stay attached and log resource use to {TELEMETRY_LOG_FILE}")
+    p_launch.add_argument("--no-wait", action="store_true", help=f"exit right away; {LAUNCH_LOG_FILE} gets click->spawn only")
+    p_launch.set_defaults(func=cli_launch)
+    p_warm = sub.add_parser("warm", help="read a client's files into the page cache ahead of launch")
+    p_warm.add_argument("folder", nargs="?", choices=CLIENT_FOLDERS)
+    p_warm.add_argument("--version", help="version folder (name or path); default: the newest")
+    p_warm.add_argument("--report", action="store_true", help="compare launch times per cache state (warm, warming, off) from the launch log")
+    p_warm.set_defaults(func=cli_warm)
+    p_prefixes = sub.add_parser("prefixes", help="list every Wine prefix found and how long each took to scan")
+    p_prefixes.add_argument("--slowest", action="store_true", help="sort by scan time")
+    p_prefixes.set_defaults(func=cli_prefixes)
+    p_usage = sub.add_parser("usage", help="disk usage per version and root, stale versions and duplicate files")
+    p_usage.add_argument("--no-duplicates", action="store_true", help="only size the folders")
+    p_usage.add_argument("--limit", type=int, default=10, help="duplicate groups to list")
+    p_usage.add_argument("--prune-stale", action="store_true",
+                         help="remove versions whose clients are all installed in a newer version")
+    p_usage.add_argument("--link", action="store_true", help="replace duplicate files with hard links")
+    p_usage.add_argument("--yes", action="store_true", help="don't ask before pruning or linking")
+    p_usage.set_defaults(func=cli_usage)
+    p_diag = sub.add_parser("diag", help="print debug information")
+    p_diag.add_argument("--json", metavar="PATH", help="write the snapshot as JSON to PATH ('-' for stdout)")
+    p_diag.set_defaults(func=cli_diag)
+    p_download = sub.add_parser("download", help="download or resume the bootstrapper")
+    p_download.add_argument("--url", help=f"default: {BOOTSTRAPPER_URL}")
+    p_download.add_argument("--sha256", help="expected hash; the file is kept only if it matches")
+    p_download.add_argument("--parts", type=int, help="parallel ranges to fetch")
+    p_download.set_defaults(func=cli_download)
+    p_catalog = sub.add_parser("catalog", help="manage the offline FFlag catalog")
+    p_catalog.add_argument("action", choices=("import", "search", "validate"))
+    p_catalog.add_argument("args", nargs="*", help="files to import/validate, or a search query")
+    p_catalog.add_argument("--versions", help="comma-separated clients the imported flags apply to, e.g. 2020L,2021M")
+    p_catalog.add_argument("--limit", type=int, default=20)
+    p_catalog.set_defaults(func=cli_catalog)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        # tkinter is only imported for the GUI so scripted runs skip Tk start-up
+        import projexstrap_gui
+        projexstrap_gui.main()
+        return 0
+    ready_at = time.perf_counter()
+    code = args.func(args)
+    if args.timing:
+        startup_ms = (ready_at - _STARTED) * 1000
+        command_ms = (time.perf_counter() - ready_at) * 1000
+        over = " OVER BUDGET" if startup_ms > STARTUP_BUDGET_MS else ""
+        print(f"startup {startup_ms:.1f} ms (budget {STARTUP_BUDGET_MS} ms){over}, {args.command} {command_ms:.1f} ms", file=sys.stderr)
+    return code
 
 if __name__ == "__main__":
-    app = Projexstrap()
-    app.mainloop()
\ No newline at end of file
+    # the GUI module imports this one by name; share it instead of loading twice
+    sys.modules.setdefault("projexstrap", sys.modules[__name__])
+    sys.exit(main())
@@ -0,0 +1,250 @@
+import os
+import sys
+import json
+import glob
+import time
+import shutil
+import random
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+import projexstrap
+
+USER = "user"
+VERSIONS_SUFFIX = os.path.join("drive_c", "users", USER, "AppData", "Local", "Pekora", "Versions")
+FLAG_PREFIXES = ("FFlag", "DFFlag", "FInt", "DFInt", "FString", "DFString", "FLog")
+
+def make_tree(home, prefixes=4, bottles=2, versions=10, folders=projexstrap.CLIENT_FOLDERS):
+    # Wine prefixes under ~/.local/share/wineprefixes and CrossOver-style
+    # bottles, each with `versions` version folders holding 2020L/2021M.
+    roots = []
+    for i in range(prefixes):
+        roots.append(os.path.join(home, ".local", "share", "wineprefixes", f"pfx{i}", VERSIONS_SUFFIX))
+    for i in range(bottles):
+        roots.append(os.path.join(home, "Library", "Application Support", "CrossOver", "Bottles", f"bottle{i}", VERSIONS_SUFFIX))
+    for root in roots:
+        for v in range(versions):
+            for folder in folders:
+                path = os.path.join(root, f"version-{v:04x}", folder)
+                os.makedirs(path, exist_ok=True)
+                open(os.path.join(path, "ProjectXPlayerBeta.exe"), "wb").close()
+    return roots
+
+def tree_roots(home):
+    home = glob.escape(home)
+    return sorted(glob.glob(os.path.join(home, ".local", "share", "wineprefixes", "*", VERSIONS_SUFFIX))
+                  + glob.glob(os.path.join(home, "Library", "Application Support", "CrossOver", "Bottles", "*", VERSIONS_SUFFIX)))
+
+def make_flags(count, seed=0):
+    rng = random.Random(seed)
+    flags = {}
+    for i in range(count):
+        prefix = FLAG_PREFIXES[i % len(FLAG_PREFIXES)]
+        name = f"{prefix}Bench{i}{rng.getrandbits(32):08x}"
+        if prefix.endswith("Flag"):
+            flags[name] = rng.choice(("True", "False"))
+        elif prefix.endswith(("Int", "Log")):
+            flags[name] = str(rng.randint(0, 100000))
+        else:
+            flags[name] = f"value-{rng.getrandbits(24):06x}"
+    return flags
+
+def timed(fn, runs):
+    samples = []
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples, result
+
+class Bench:
+    def __init__(self, runs):
+        self.runs = runs
+        self.results = []
+
+    def record(self, name, fn, runs=None, setup=None, **params):
+        if setup:
+            setup()
+        samples, result = timed(fn, runs or self.runs)
+        entry = {
+            "name": name,
+            "params": params,
+            "runs": len(samples),
+            "median_ms": round(statistics.median(samples), 3),
+            "min_ms": round(min(samples), 3),
+            "max_ms": round(max(samples), 3),
+        }
+        self.results.append(entry)
+        print(f"{name:<34} {json.dumps(params):<44} median {entry['median_ms']:>10.3f} ms", file=sys.stderr)
+        return result
+
+    def skip(self, name, reason, **params):
+        self.results.append({"name": name, "params": params, "skipped": reason})
+        print(f"{name:<34} {json.dumps(params):<44} skipped: {reason}", file=sys.stderr)
+
+def bench_discovery(bench, home, workdir, tree):
+    index_path = os.path.join(workdir, "install_index.json")
+
+    def fresh_index():
+        projexstrap._install_index = projexstrap.InstallIndex(path=index_path, roots_fn=lambda: tree_roots(home))
+        return projexstrap._install_index
+
+    def cold():
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        fresh_index()
+        return list(projexstrap.iter_version_dirs())
+
+    def discover(path=None):
+        return projexstrap.PrefixDiscovery(settings={"discovery_ttl_s": 0}, path=path).roots()
+
+    discovery_path = os.path.join(workdir, "prefix_discovery.json")
+
+    # expanduser follows HOME, so the launcher layouts resolve into the tree;
+    # a real $WINEPREFIX would add a candidate outside it
+    saved_home = os.environ.get("HOME")
+    saved_prefix = os.environ.pop("WINEPREFIX", None)
+    os.environ["HOME"] = home
+    try:
+        found = bench.record("discover_prefixes", discover, **tree)
+        # a new process with the saved discovery: only mtimes are checked
+        discover(discovery_path)
+        bench.record("discover_prefixes.from_disk", lambda: discover(discovery_path), **tree)
+    finally:
+        if saved_home is None:
+            del os.environ["HOME"]
+        else:
+            os.environ["HOME"] = saved_home
+        if saved_prefix is not None:
+            os.environ["WINEPREFIX"] = saved_prefix
+    assert len(found) == len(tree_roots(home)), "discovery should find every synthetic root"
+    dirs = bench.record("iter_version_dirs.cold", cold, **tree)
+    fresh_index()
+    bench.record("iter_version_dirs.warm", lambda: list(projexstrap.iter_version_dirs()), versions_found=len(dirs), **tree)
+    # a new process: read the saved index, then only stat the roots
+    bench.record("iter_version_dirs.from_disk", lambda: fresh_index().refresh(), **tree)
+    bench.record("get_clientsettings_targets", projexstrap.get_clientsettings_targets, **tree)
+
+def bench_apply(bench, home, tree, flag_counts):
+    targets = projexstrap.get_clientsettings_targets()
+
+    def clear():
+        for client_dir, settings_path, folder in targets:
+            if os.path.exists(settings_path):
+                os.remove(settings_path)
+
+    for count in flag_counts:
+        flags = make_flags(count)
+        bench.record("apply_fastflags.write", lambda: projexstrap.apply_fastflags_to_clients(flags),
+                     runs=1, setup=clear, flags=count, targets=len(targets), **tree)
+        report = bench.record("apply_fastflags.unchanged", lambda: projexstrap.apply_fastflags_to_clients(flags),
+                              flags=count, targets=len(targets), **tree)
+        assert all(r["status"] == "skipped" for r in report), "re-apply should skip every target"
+
+def bench_flags(bench, workdir, flag_counts):
+    for count in flag_counts:
+        flags = make_flags(count)
+        values = list(flags.values())
+        bench.record("auto_detect_value_type", lambda: [projexstrap.auto_detect_value_type(v) for v in values], flags=count)
+        items = list(flags.items())
+        bench.record("parse_flag_value", lambda: [projexstrap.parse_flag_value(k, v) for k, v in items], flags=count)
+        path = os.path.join(workdir, f"flags-{count}.json")
+        with open(path, "w") as f:
+            json.dump(flags, f, indent=2)
+        bench.record("iter_flags_json", lambda: sum(1 for _ in projexstrap.iter_flags_json(path)), flags=count)
+        bench.record("merge_flag_files", lambda: projexstrap.merge_flag_files([path], {}), flags=count)
+        index = bench.record("FlagIndex.build", lambda: projexstrap.FlagIndex(flags), flags=count)
+        bench.record("FlagIndex.search", lambda: [index.search(q) for q in ("f", "fi", "fin", "fint", "bench1")], flags=count)
+
+def bench_editor(bench, flag_counts):
+    try:
+        import tkinter as tk
+        import projexstrap_gui
+        root = tk.Tk()
+    except Exception as e:
+        for count in flag_counts:
+            bench.skip("FastFlagsEditor.populate_list", f"no Tk display ({e.__class__.__name__})", flags=count)
+        return
+    root.withdraw()
+    # the editor only reads the palette off its parent
+    root.bg, root.card, root.fg, root.sub, root.warn = "#151515", "#252525", "#e6eef8", "#9aa9ba", "#f0b429"
+    try:
+        for count in flag_counts:
+            editor = projexstrap_gui.FastFlagsEditor(root, make_flags(count))
+            editor.update_idletasks()
+            bench.record("FastFlagsEditor.populate_list", editor.populate_list, flags=count)
+            bench.record("FastFlagsEditor.scroll_page", lambda: editor.on_scroll("scroll", 1, "pages"), flags=count)
+            editor.destroy()
+    finally:
+        root.destroy()
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+def parse_counts(text):
+    return [int(c) for c in text.split(",") if c.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="projexstrap_bench",
+                                     description="Time discovery, apply and editor paths over a synthetic Wine-prefix tree.")
+    parser.add_argument("--prefixes", type=int, default=4)
+    parser.add_argument("--bottles", type=int, default=2)
+    parser.add_argument("--versions", type=int, default=10, help="version folders per prefix/bottle")
+    parser.add_argument("--flags", type=parse_counts, default=[10, 1000, 100000], help="comma-separated flag counts")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--only", choices=("discovery", "apply", "flags", "editor"), action="append")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic tree")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="projexstrap-bench-")
+    home = os.path.join(workdir, "home")
+    cwd = os.getcwd()
+    bench = Bench(args.runs)
+    tree = {"prefixes": args.prefixes, "bottles": args.bottles, "versions": args.versions}
+    sections = args.only or ["discovery", "apply", "flags", "editor"]
+    try:
+        make_tree(home, args.prefixes, args.bottles, args.versions)
+        # Modifications/ is resolved against the working directory
+        os.chdir(workdir)
+        if "discovery" in sections or "apply" in sections:
+            bench_discovery(bench, home, workdir, tree)
+        if "apply" in sections:
+            bench_apply(bench, home, tree, args.flags)
+        if "flags" in sections:
+            bench_flags(bench, workdir, args.flags)
+        if "editor" in sections:
+            bench_editor(bench, args.flags)
+    finally:
+        os.chdir(cwd)
+        if args.keep:
+            print(f"tree kept at {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = {
+        "revision": git_revision(),
+        "time": time.time(),
+        "python": sys.version.split()[0],
+        "platform": f"{platform.system()} {platform.release()} {platform.machine()}",
+        "cpus": os.cpu_count(),
+        "results": bench.results,
+    }
+    text = json.dumps(output, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
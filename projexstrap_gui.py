@@ -0,0 +1,1030 @@
+import os
+import sys
+import json
+import time
+import bisect
+import subprocess
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog, simpledialog
+from tkinter import font as tkfont
+
+from projexstrap import (
+    BOOTSTRAPPER_FILE, CLIENT_FOLDERS, BackgroundRunner, TaskCancelled, get_system_info,
+    iter_version_dirs, get_executable_paths,
+    FlagIndex, flag_type, get_flag_store, apply_local_flags,
+    summarize_apply, get_flag_catalog, get_installed_client_folders, parse_flag_value, format_flag_issues,
+    MERGE_POLICIES, MergeConflictError, merge_flag_files, import_fastflags_files, format_merge_report,
+    download_bootstrapper, get_launch_engine, launch_executable, LaunchScheduler, load_launch_batch,
+    get_supervisor, TELEMETRY_LOG_FILE, get_profile_manager, apply_profile, PROFILES_DIR, load_settings,
+    save_settings, FlagWatcher, collect_diagnostics, format_diagnostics, export_diagnostics, get_backup_store,
+    get_cache_warmer, analyze_installations, prune_versions, link_duplicates, format_size,
+    get_startup_timeline, FIRST_PAINT_BUDGET_MS, rollback_clients,
+)
+
+class Projexstrap(tk.Tk):
+    # Startup is staged: __init__ only builds the sidebar, the Versions and
+    # Clients tabs and cheap objects. Scans, the supervisor, the watcher and
+    # wineserver start after the first paint, and the FastFlags and Debug
+    # tabs are built the first time they are selected. Every stage is
+    # marked on the startup timeline (see the Debug tab).
+    def __init__(self):
+        self.timeline = get_startup_timeline()
+        self.timeline.mark("imports")
+        super().__init__()
+        self.timeline.mark("tk")
+        self.title("Projexstrap")
+        self.geometry("920x640")
+        self.minsize(880, 560)
+        self.bg = "#151515"     # main background
+        self.panel = "#252525"  # panels
+        self.card = "#252525"   # card surfaces
+        self.fg = "#e6eef8"     # text
+        self.sub = "#9aa9ba"    # secondary text
+        self.accent = "#606060" # accent
+        self.warn = "#f0b429"
+        self.error = "#f97373"
+        self.configure(bg=self.bg)
+        self.style = ttk.Style(self)
+        self._setup_style()
+        self.store = get_flag_store()
+        self.settings = load_settings()
+        self._preview_version = None
+        self._preview_job = None
+        self.diagnostics = None
+        self.runner = BackgroundRunner()
+        self.launch_engine = get_launch_engine()
+        self.supervisor = get_supervisor()
+        self.watcher = FlagWatcher(settings=self.settings)
+        self._watch_job = None
+        self.flags_preview = None
+        self.debug_text = None
+        self.merge_policy = tk.StringVar(value=MERGE_POLICIES[0])
+        self.profile_var = tk.StringVar(value=self.settings.get("active_profile") or "")
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.create_layout()
+        self.timeline.mark("layout")
+        self._poll_runner()
+        self.after(0, self._after_first_paint)
+
+    def _after_first_paint(self):
+        # the first timer callback of mainloop; flushing idle work here draws
+        # the window, so everything below runs behind a painted UI
+        self.update_idletasks()
+        self.timeline.mark("first_paint")
+        self.refresh_version_list()
+        self.run_task("Preparing profiles", lambda task: get_profile_manager().warm())
+        self.supervisor.start()
+        self.refresh_clients_view()
+        if self.watch_var.get():
+            self.watcher.start()
+            self.refresh_watch_status()
+        if self.launch_engine.settings.get("prestart_wineserver") and not get_system_info()['is_windows']:
+            self.run_task("Starting wineserver", lambda task: self.launch_engine.prestart_detected())
+        self.timeline.mark("deferred_started")
+
+    def on_tab_changed(self, event=None):
+        frame = self.nametowidget(self.tabs.select())
+        build = self._tab_builders.pop(str(frame), None)
+        if build:
+            build(frame)
+            self.timeline.mark(f"{self.tabs.tab(frame, 'text').lower()}_tab")
+
+    def _setup_style(self):
+        self.style.theme_use('clam')
+        self.style.configure("TFrame", background=self.panel)
+        self.style.configure("Card.TFrame", background=self.card, relief="flat")
+        self.style.configure("TLabel", background=self.panel, foreground=self.fg, font=("Segoe UI", 10))
+        self.style.configure("Heading.TLabel", font=("Segoe UI Semibold", 14), foreground=self.fg)
+        self.style.configure("Sub.TLabel", foreground=self.sub, font=("Segoe UI", 9))
+        self.style.configure("TButton", background=self.accent, foreground=self.bg, font=("Segoe UI Semibold", 10))
+        self.style.map("TButton", background=[('active', '#404040')])
+        self.style.configure("Accent.TButton", background=self.accent, foreground=self.bg, font=("Segoe UI Semibold", 10))
+        self.style.configure("Danger.TButton", background=self.error, foreground=self.bg)
+        self.style.configure("TEntry", fieldbackground=self.card, background=self.card, foreground=self.fg)
+        self.style.configure("Treeview", background=self.card, fieldbackground=self.card, foreground=self.fg, rowheight=24)
+        self.style.map("Treeview", background=[("selected", "#404040")], foreground=[("selected", self.fg)])
+        self.style.configure("Vertical.TScrollbar", background=self.card, troughcolor=self.panel, arrowcolor=self.accent)
+
+    def create_layout(self):
+        top = ttk.Frame(self, style="TFrame")
+        top.pack(fill="x", padx=18, pady=14)
+
+        ttk.Label(top, text="Projexstrap", style="Heading.TLabel").pack(side="left")
+        ttk.Label(top, text="• Projexstrap - Dark", style="Sub.TLabel").pack(side="left", padx=(8,0))
+
+        container = ttk.Frame(self, style="TFrame")
+        container.pack(fill="both", expand=True, padx=18, pady=(0,18))
+
+        left = ttk.Frame(container, width=260, style="Card.TFrame")
+        left.pack(side="left", fill="y", padx=(0,12), pady=2)
+        left.pack_propagate(False)
+
+        right = ttk.Frame(container, style="TFrame")
+        right.pack(side="left", fill="both", expand=True)
+
+        ttk.Label(left, text="Quick Actions", style="Sub.TLabel").pack(anchor="w", padx=14, pady=(8,4))
+        pad = {"padx": 12, "pady": 6, "ipadx": 6, "ipady": 6}
+        ttk.Button(left, text="Launch 2020 (2020L)", style="Accent.TButton", command=lambda: self.launch_version_ui("2020L")).pack(fill="x", **pad)
+        ttk.Button(left, text="Launch 2021 (2021M)", style="Accent.TButton", command=lambda: self.launch_version_ui("2021M")).pack(fill="x", **pad)
+        ttk.Button(left, text="Set FastFlags", command=self.open_fastflags_editor).pack(fill="x", **pad)
+        self.btn_dl = ttk.Button(left, text="Download/Update Bootstrapper", command=self.download_bootstrapper_ui)
+        self.btn_dl.pack(fill="x", **pad)
+
+        ttk.Button(left, text="Debug Info", command=self.open_debug_window).pack(fill="x", **pad)
+        ttk.Separator(left).pack(fill="x", padx=12, pady=(6,12))
+        bb = ttk.Frame(left, style="Card.TFrame")
+        bb.pack(fill="x", padx=12, pady=(0,12))
+        ttk.Label(bb, text="Bootstrapper", style="Sub.TLabel").pack(anchor="w", padx=8, pady=(8,0))
+        self.bs_status = ttk.Label(bb, text="Checking...", style="TLabel")
+        self.bs_status.pack(anchor="w", padx=8, pady=(2,10))
+        tb = ttk.Frame(left, style="Card.TFrame")
+        tb.pack(fill="x", padx=12, pady=(0,12))
+        ttk.Label(tb, text="Tasks", style="Sub.TLabel").pack(anchor="w", padx=8, pady=(8,0))
+        self.task_status = ttk.Label(tb, text="Idle", style="TLabel", wraplength=220)
+        self.task_status.pack(anchor="w", padx=8, pady=(2,4))
+        self.task_progress = ttk.Progressbar(tb, mode="determinate")
+        self.task_progress.pack(fill="x", padx=8, pady=(0,4))
+        self.btn_cancel = ttk.Button(tb, text="Cancel", command=self.runner.cancel_all, state="disabled")
+        self.btn_cancel.pack(anchor="e", padx=8, pady=(0,8))
+        self.watch_var = tk.BooleanVar(value=bool(self.settings.get("watch_enabled")))
+        ttk.Checkbutton(left, text="Keep flags applied after updates", variable=self.watch_var,
+                        command=self.toggle_watcher).pack(anchor="w", padx=14)
+        self.watch_status = ttk.Label(left, text="", style="Sub.TLabel", wraplength=220)
+        self.watch_status.pack(anchor="w", padx=14, pady=(0,8))
+
+        tabs = self.tabs = ttk.Notebook(right)
+        tabs.pack(fill="both", expand=True)
+        self._tab_builders = {}
+
+        frame_versions = ttk.Frame(tabs, style="TFrame")
+        tabs.add(frame_versions, text="Versions")
+
+        ttk.Label(frame_versions, text="Detected Installations", style="Sub.TLabel").pack(anchor="w", padx=14, pady=(12,6))
+        self.versions_tree = ttk.Treeview(frame_versions, columns=("path", "size"), show="headings", selectmode="browse", height=10)
+        self.versions_tree.heading("path", text="Installation path")
+        self.versions_tree.heading("size", text="Size")
+        self.versions_tree.column("path", anchor="w", width=560)
+        self.versions_tree.column("size", anchor="e", width=90)
+        self.versions_tree.pack(fill="both", padx=14, pady=(0,8), expand=True)
+        self.versions_tree.bind("<<TreeviewSelect>>", self.on_version_selected)
+        vbtnframe = ttk.Frame(frame_versions, style="TFrame")
+        vbtnframe.pack(fill="x", padx=14, pady=(0,12))
+        ttk.Button(vbtnframe, text="Refresh", command=lambda: self.refresh_version_list(force=True)).pack(side="left")
+        ttk.Button(vbtnframe, text="Open in Explorer", command=self.open_selected_path).pack(side="left", padx=6)
+        ttk.Button(vbtnframe, text="Launch selected Client", command=self.launch_selected).pack(side="left", padx=6)
+        ttk.Button(vbtnframe, text="Launch Batch...", command=self.launch_batch_ui).pack(side="left", padx=6)
+        ttk.Button(vbtnframe, text="Disk Usage...", command=self.disk_usage_ui).pack(side="left", padx=6)
+
+        frame_flags = ttk.Frame(tabs, style="TFrame")
+        tabs.add(frame_flags, text="FastFlags")
+        self._tab_builders[str(frame_flags)] = self.build_flags_tab
+
+        frame_clients = ttk.Frame(tabs, style="TFrame")
+        tabs.add(frame_clients, text="Clients")
+
+        ttk.Label(frame_clients, text="Launched Clients", style="Sub.TLabel").pack(anchor="w", padx=14, pady=(12,6))
+        columns = (("label", "Client", 120), ("pid", "PID", 60), ("cpu", "CPU %", 60), ("rss", "RSS MB", 70),
+                   ("threads", "Threads", 60), ("io", "I/O MB r/w", 100), ("uptime", "Uptime", 70), ("status", "Status", 90))
+        self.clients_tree = ttk.Treeview(frame_clients, columns=[c[0] for c in columns], show="headings", height=10)
+        for key, title, width in columns:
+            self.clients_tree.heading(key, text=title)
+            self.clients_tree.column(key, anchor="w", width=width)
+        self.clients_tree.pack(fill="both", padx=14, pady=(0,8), expand=True)
+        ttk.Label(frame_clients, text=f"Samples are logged to {TELEMETRY_LOG_FILE}", style="Sub.TLabel").pack(anchor="w", padx=14, pady=(0,12))
+
+        frame_debug = ttk.Frame(tabs, style="TFrame")
+        tabs.add(frame_debug, text="Debug")
+        self._tab_builders[str(frame_debug)] = self.build_debug_tab
+        tabs.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+    def build_flags_tab(self, frame_flags):
+        topbar = ttk.Frame(frame_flags, style="TFrame")
+        topbar.pack(fill="x", padx=14, pady=(12,8))
+        ttk.Button(topbar, text="Open Editor", command=self.open_fastflags_editor).pack(side="left")
+        ttk.Button(topbar, text="Apply to Clients", command=self.apply_fastflags_ui).pack(side="left", padx=6)
+        ttk.Button(topbar, text="Import JSON...", command=self.import_fastflags_from_file).pack(side="left", padx=6)
+        ttk.Button(topbar, text="Import Folder...", command=self.import_fastflags_folder).pack(side="left", padx=6)
+        ttk.Combobox(topbar, textvariable=self.merge_policy, values=MERGE_POLICIES, state="readonly", width=16).pack(side="left", padx=6)
+        ttk.Button(topbar, text="Import Catalog...", command=self.import_catalog).pack(side="left", padx=6)
+
+        profilebar = ttk.Frame(frame_flags, style="TFrame")
+        profilebar.pack(fill="x", padx=14, pady=(0,8))
+        ttk.Label(profilebar, text="Profile", style="Sub.TLabel").pack(side="left")
+        self.profile_box = ttk.Combobox(profilebar, textvariable=self.profile_var, state="readonly", width=24,
+                                        postcommand=self.refresh_profiles)
+        self.profile_box.pack(side="left", padx=6)
+        ttk.Button(profilebar, text="Switch to Profile", command=self.apply_profile_ui).pack(side="left", padx=6)
+        ttk.Button(profilebar, text="Roll Back...", command=self.rollback_ui).pack(side="left", padx=6)
+
+        self.flags_preview = tk.Text(frame_flags, height=16, wrap="none", bg=self.card, fg=self.fg, bd=0, padx=10, pady=8)
+        self.flags_preview.pack(fill="both", expand=True, padx=14, pady=(0,12))
+        self._preview_version = None
+        self.schedule_preview(delay=0)
+
+    def build_debug_tab(self, frame_debug):
+        debugbar = ttk.Frame(frame_debug, style="TFrame")
+        debugbar.pack(fill="x", padx=14, pady=(12,6))
+        ttk.Label(debugbar, text="Quick Debug", style="Sub.TLabel").pack(side="left")
+        ttk.Button(debugbar, text="Export JSON...", command=self.export_diagnostics_ui).pack(side="right")
+        ttk.Button(debugbar, text="Refresh", command=self.refresh_debug_info).pack(side="right", padx=6)
+        self.debug_text = tk.Text(frame_debug, height=20, bg=self.card, fg=self.fg, bd=0, padx=10, pady=8)
+        self.debug_text.pack(fill="both", expand=True, padx=14, pady=(0,12))
+        self.refresh_debug_info()
+
+    def run_task(self, name, fn, on_done=None, on_error=None, on_cancel=None):
+        def failed(error):
+            if isinstance(error, TaskCancelled):
+                self.task_status.config(text=f"Cancelled: {name}")
+                if on_cancel:
+                    on_cancel()
+            elif on_error:
+                on_error(error)
+            else:
+                messagebox.showerror(name, f"{name} failed: {error}")
+        self.task_status.config(text=f"{name}...")
+        self.btn_cancel.config(state="normal")
+        return self.runner.submit(name, fn, on_done=on_done, on_error=failed, on_progress=self._task_progress)
+
+    def _task_progress(self, task, done, total, message):
+        if total:
+            self.task_progress.config(maximum=total, value=done)
+        self.task_status.config(text=message or task.name)
+
+    def _poll_runner(self):
+        if self.runner.poll() and not self.runner.active:
+            self.task_progress.config(value=0)
+            self.btn_cancel.config(state="disabled")
+            if not self.task_status.cget("text").startswith("Cancelled"):
+                self.task_status.config(text="Idle")
+        self.after(50, self._poll_runner)
+
+    def on_close(self):
+        self.runner.shutdown()
+        self.supervisor.stop()
+        self.watcher.stop()
+        self.destroy()
+
+    def toggle_watcher(self):
+        enabled = self.watch_var.get()
+        self.settings["watch_enabled"] = enabled
+        settings = load_settings()
+        settings["watch_enabled"] = enabled
+        save_settings(settings)
+        if enabled:
+            self.watcher.start()
+        else:
+            self.watcher.stop()
+        self.refresh_watch_status()
+
+    def refresh_watch_status(self):
+        if self._watch_job is not None:
+            self.after_cancel(self._watch_job)
+            self._watch_job = None
+        if not self.watch_var.get():
+            self.watch_status.config(text="")
+            return
+        if self.watcher.last_error:
+            text = f"Re-apply failed: {self.watcher.last_error}"
+        elif self.watcher.last_report is not None:
+            counts = summarize_apply(self.watcher.last_report)
+            text = f"Watching; last check wrote {counts['written']}, {counts['skipped']} unchanged"
+        else:
+            text = "Watching..."
+        self.watch_status.config(text=text)
+        self._watch_job = self.after(1000, self.refresh_watch_status)
+
+    def refresh_clients_view(self):
+        rows = {}
+        for n, instance in enumerate(self.launch_engine.instances):
+            stats = instance.get("stats") or {}
+            proc = instance["proc"]
+            io = "-"
+            if stats.get("read_bytes") is not None:
+                io = f"{stats['read_bytes'] / 1048576:.1f} / {stats['write_bytes'] / 1048576:.1f}"
+            exit_code = stats.get("exit_code")
+            rows[str(n)] = (
+                instance["label"], proc.pid,
+                "-" if stats.get("cpu_pct") is None else stats["cpu_pct"],
+                stats.get("rss_mb", "-"), stats.get("threads", "-"), io,
+                f"{stats.get('uptime_s', 0):.0f} s",
+                "running" if exit_code is None else f"exited ({exit_code})",
+            )
+        for iid, values in rows.items():
+            if self.clients_tree.exists(iid):
+                self.clients_tree.item(iid, values=values)
+            else:
+                self.clients_tree.insert("", "end", iid=iid, values=values)
+        self.after(int(self.supervisor.interval_s * 1000), self.refresh_clients_view)
+
+    def refresh_version_list(self, force=False):
+        def done(versions):
+            for i in self.versions_tree.get_children():
+                self.versions_tree.delete(i)
+            for ver in versions:
+                self.versions_tree.insert("", "end", values=(ver, ""))
+            if not versions:
+                self.versions_tree.insert("", "end", values=("No installations found", ""))
+            if "versions" not in self.timeline.marks:
+                self.timeline.mark("versions")
+                self.report_startup()
+            if versions and self.settings.get("warm_cache"):
+                self.run_task("Warming client files", lambda task: get_cache_warmer().warm_latest(task))
+        self.run_task("Scanning installations", lambda task: list(iter_version_dirs(force=force, task=task)), on_done=done)
+        self.refresh_bs_status()
+        self.refresh_fastflags_view()
+
+    def disk_usage_ui(self):
+        def done(result):
+            if not result["versions"]:
+                messagebox.showinfo("Disk Usage", "No installations found.")
+                return
+            sizes = {v["path"]: v for v in result["versions"]}
+            for item in self.versions_tree.get_children():
+                path = self.versions_tree.item(item)['values'][0]
+                if path in sizes:
+                    stale = " (stale)" if sizes[path]["stale"] else ""
+                    self.versions_tree.set(item, "size", format_size(sizes[path]["bytes"]) + stale)
+            total = sum(r["bytes"] for r in result["roots"].values())
+            stale = [v for v in result["versions"] if v["stale"]]
+            stale_bytes = sum(v["bytes"] for v in stale)
+            messagebox.showinfo("Disk Usage",
+                                f"{len(result['versions'])} version(s) in {len(result['roots'])} location(s): {format_size(total)}\n"
+                                f"Stale versions: {len(stale)} ({format_size(stale_bytes)})\n"
+                                f"Duplicate files: {format_size(result['reclaimable'])} reclaimable by hard-linking")
+            prune = stale and messagebox.askyesno(
+                "Disk Usage", f"Remove {len(stale)} stale version(s) ({format_size(stale_bytes)})? "
+                              "Only versions whose clients are all installed in a newer version are removed.")
+            link = result["duplicates"] and messagebox.askyesno(
+                "Disk Usage", f"Replace duplicate files with hard links to reclaim up to {format_size(result['reclaimable'])}?")
+            if not (prune or link):
+                return
+
+            def work(task):
+                report = prune_versions([v["path"] for v in stale], task) if prune else []
+                return report, link_duplicates(result["duplicates"] if link else [], task)
+
+            def finished(outcome):
+                report, linked = outcome
+                lines = []
+                if prune:
+                    lines.append(f"Removed {sum(r['status'] == 'removed' for r in report)} stale version(s).")
+                    lines.extend(f" - {r['path']}: {r['error']}" for r in report if r["status"] == "failed")
+                if link:
+                    lines.append(f"Linked {linked['linked']} file(s), reclaimed {format_size(linked['bytes'])}.")
+                    if linked["errors"]:
+                        lines.append(f"{len(linked['errors'])} file(s) could not be linked.")
+                messagebox.showinfo("Disk Usage", "\n".join(lines))
+                self.refresh_version_list()
+            self.run_task("Reclaiming disk space", work, on_done=finished)
+        self.run_task("Analyzing disk usage", lambda task: analyze_installations(task), on_done=done)
+
+    def on_version_selected(self, event=None):
+        sel = self.versions_tree.selection()
+        if not sel or not self.settings.get("warm_cache"):
+            return
+        path = self.versions_tree.item(sel[0])['values'][0]
+        if os.path.isdir(path):
+            self.run_task("Warming client files", lambda task: get_cache_warmer().warm_version(path, task))
+
+    def report_startup(self):
+        self.timeline.save()
+        first_paint = self.timeline.marks.get("first_paint")
+        if first_paint is not None and first_paint > FIRST_PAINT_BUDGET_MS:
+            print(f"startup: first paint after {first_paint} ms (budget {FIRST_PAINT_BUDGET_MS} ms)", file=sys.stderr)
+
+    def open_selected_path(self):
+        sel = self.versions_tree.selection()
+        if not sel:
+            messagebox.showinfo("Open", "No path selected")
+            return
+        path = self.versions_tree.item(sel[0])['values'][0]
+        if path and os.path.isdir(path):
+            if get_system_info()['is_windows']:
+                subprocess.Popen(["explorer", os.path.normpath(path)])
+            else:
+                try:
+                    subprocess.Popen(["xdg-open", path])
+                except Exception:
+                    messagebox.showinfo("Open", f"Can't open folder on your platform: {path}")
+        else:
+            messagebox.showinfo("Open", f"Path not found: {path}")
+
+    def launch_selected(self):
+        sel = self.versions_tree.selection()
+        if not sel:
+            messagebox.showinfo("Launch", "No installation selected")
+            return
+        path = self.versions_tree.item(sel[0])['values'][0]
+        clicked_at = time.perf_counter()
+
+        def work(task):
+            for folder in CLIENT_FOLDERS:
+                exe = os.path.join(path, folder, "ProjectXPlayerBeta.exe")
+                if os.path.isfile(exe):
+                    return exe, launch_executable(exe, clicked_at=clicked_at)
+            return None, None
+
+        def done(result):
+            exe, launched = result
+            if exe is None:
+                messagebox.showinfo("Launch", "No executable found inside selected installation.")
+                return
+            ok, err = launched
+            if ok:
+                messagebox.showinfo("Launch", f"Launched: {os.path.basename(exe)}")
+            else:
+                messagebox.showerror("Launch failed", err or "Unknown error")
+        self.run_task("Launching client", work, on_done=done)
+
+    def launch_version_ui(self, folder):
+        clicked_at = time.perf_counter()
+
+        def work(task):
+            paths = get_executable_paths(folder)
+            for p in paths:
+                task.check()
+                if os.path.isfile(p):
+                    return p, len(paths), launch_executable(p, clicked_at=clicked_at)
+            return None, len(paths), None
+
+        def done(result):
+            exe_path, searched, launched = result
+            if exe_path:
+                ok, err = launched
+                if ok:
+                    messagebox.showinfo("Launch", f"Launched {folder}")
+                else:
+                    messagebox.showerror("Launch failed", err or "Unknown error")
+            else:
+                messagebox.showwarning("Not Found", f"No executable found for {folder}. Searched {searched} places.")
+                if messagebox.askyesno("Troubleshoot", "Open debug window to view searched paths?"):
+                    self.open_debug_window()
+        self.run_task(f"Launching {folder}", work, on_done=done)
+
+    def launch_batch_ui(self):
+        fn = filedialog.askopenfilename(title="Launch batch (JSON list of instances)",
+                                        filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        if not fn:
+            return
+        try:
+            specs = load_launch_batch(fn)
+        except Exception as e:
+            messagebox.showerror("Launch batch", f"Failed to read batch: {e}")
+            return
+        scheduler = LaunchScheduler(self.launch_engine)
+
+        def done(results):
+            ok = [r for r in results if r["ok"]]
+            msg = f"Started {len(ok)} of {len(results)} instance(s)."
+            failed = [f" - {r['label']}: {r['error']}" for r in results if not r["ok"]]
+            if failed:
+                messagebox.showwarning("Launch batch", msg + "\n" + "\n".join(failed))
+            else:
+                messagebox.showinfo("Launch batch", msg)
+        self.run_task(f"Launching {len(specs)} instance(s)", lambda task: scheduler.run(specs, task=task), on_done=done)
+
+    def refresh_profiles(self):
+        self.profile_box.config(values=get_profile_manager().names())
+
+    def apply_profile_ui(self):
+        name = self.profile_var.get()
+        if not name:
+            messagebox.showinfo("Profiles", f"No profile selected. Profiles live in {PROFILES_DIR}.")
+            return
+
+        def done(report):
+            counts = summarize_apply(report)
+            msg = f"Switched to {name}: {counts['written']} target(s) changed, {counts['skipped']} already matched."
+            if counts["failed"]:
+                failed = [f" - {r['path']}: {r['error']}" for r in report if r["status"] == "failed"]
+                messagebox.showwarning("Profiles", msg + "\n" + "\n".join(failed))
+            else:
+                messagebox.showinfo("Profiles", msg)
+        self.run_task(f"Switching to {name}", lambda task: apply_profile(name, task=task), on_done=done)
+
+    def rollback_ui(self):
+        store = get_backup_store()
+        store.load()
+        points = store.points()
+        if len(points) < 2:
+            messagebox.showinfo("Roll Back", "There is no earlier ClientAppSettings state to roll back to yet.")
+            return
+        lines = []
+        for n, point in enumerate(points[:15], 1):
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(point["time"]))
+            lines.append(f"{n}. {stamp} ({point['targets']} target(s), {'/'.join(sorted(point['kinds']))})")
+        n = simpledialog.askinteger("Roll Back", "Restore every client to the state at point:\n\n" + "\n".join(lines),
+                                    parent=self, minvalue=1, maxvalue=min(len(points), 15), initialvalue=2)
+        if not n:
+            return
+        when = points[n - 1]["time"]
+
+        def done(report):
+            counts = summarize_apply(report)
+            msg = f"Restored {counts['written']} target(s), {counts['skipped']} already matched."
+            if counts["failed"]:
+                failed = [f" - {r['path']}: {r['error']}" for r in report if r["status"] == "failed"]
+                messagebox.showwarning("Roll Back", msg + "\n" + "\n".join(failed))
+            else:
+                messagebox.showinfo("Roll Back", msg)
+            self.profile_var.set("")
+        self.run_task("Rolling back ClientAppSettings", lambda task: rollback_clients(when, task=task), on_done=done)
+
+    def refresh_fastflags_view(self):
+        self.store.reload_if_changed()
+        self.schedule_preview()
+
+    def schedule_preview(self, delay=75):
+        # bursts of changes collapse into one render of the latest version
+        if self._preview_job is None:
+            self._preview_job = self.after(delay, self.render_fastflags_preview)
+
+    def render_fastflags_preview(self):
+        self._preview_job = None
+        if self.flags_preview is None or self.store.version == self._preview_version:
+            return
+        self._preview_version = self.store.version
+        pretty = json.dumps(self.store.snapshot(), indent=2)
+        self.flags_preview.delete("1.0", tk.END)
+        self.flags_preview.insert(tk.END, pretty)
+
+    def open_fastflags_editor(self):
+        FastFlagsEditor(self, self.store.snapshot(), on_save=self.on_fastflags_saved)
+
+    def on_fastflags_saved(self, new_flags):
+        if not self.store.replace(new_flags):
+            messagebox.showinfo("Saved", "No changes to save.")
+            return
+        try:
+            self.store.save()
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to save FastFlags: {e}")
+            return
+        self.schedule_preview()
+        messagebox.showinfo("Saved", "FastFlags saved locally.")
+
+    def apply_fastflags_ui(self):
+        flags = self.store.snapshot()
+        if not flags:
+            messagebox.showwarning("No Flags", "No FastFlags to apply.")
+            return
+
+        def done(report):
+            counts = summarize_apply(report)
+            msg = f"Applied to {counts['written']} path(s), {counts['skipped']} already up to date.\n"
+            if counts["failed"]:
+                msg += f"\nFailed for {counts['failed']} path(s):"
+                for result in report:
+                    if result["status"] == "failed":
+                        msg += f"\n - {result['path']}: {result['error']}"
+                messagebox.showwarning("Apply complete", msg)
+            else:
+                messagebox.showinfo("Apply complete", msg)
+            self.profile_var.set("")
+            self.refresh_debug_info()
+
+        def validated(issues):
+            if issues and not messagebox.askyesno(
+                    "Catalog validation",
+                    f"{len(issues)} flag(s) failed catalog validation:\n{format_flag_issues(issues)}\n\nApply anyway?"):
+                return
+            self.run_task("Applying FastFlags", lambda task: apply_local_flags(flags, task=task), on_done=done)
+        self.run_task("Validating FastFlags",
+                      lambda task: get_flag_catalog().validate(flags, versions=get_installed_client_folders()),
+                      on_done=validated)
+
+    def ask_import_paths(self, parent=None):
+        fns = filedialog.askopenfilenames(title="Import FastFlags JSON", parent=parent or self,
+                                          filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        return list(fns)
+
+    def import_fastflags_from_file(self, paths=None):
+        paths = paths or self.ask_import_paths()
+        if not paths:
+            return
+        policy = self.merge_policy.get()
+
+        def work(task):
+            merged, report = import_fastflags_files(paths, policy, task=task)
+            added = {key: merged[key] for key in report["added"]}
+            added.update((c["key"], merged[c["key"]]) for c in report["conflicts"])
+            task.progress(0, 0, "Checking imported flags against the catalog")
+            return report, get_flag_catalog().validate(added)
+
+        def done(result):
+            report, issues = result
+            self.schedule_preview()
+            msg = format_merge_report(report)
+            if issues:
+                messagebox.showwarning("Imported", f"{msg}\n\n{len(issues)} failed catalog validation:\n{format_flag_issues(issues)}")
+            else:
+                messagebox.showinfo("Imported", msg)
+
+        def failed(error):
+            if isinstance(error, MergeConflictError):
+                messagebox.showerror("Import aborted", f"{format_merge_report(error.report)}\n\nNothing was written.")
+            else:
+                messagebox.showerror("Error", f"Failed to import: {error}")
+        self.run_task("Importing FastFlags", work, on_done=done, on_error=failed)
+
+    def import_fastflags_folder(self):
+        folder = filedialog.askdirectory(title="Import every FastFlags JSON in a folder")
+        if folder:
+            self.import_fastflags_from_file([folder])
+
+    def import_catalog(self):
+        fns = filedialog.askopenfilenames(title="Import FFlag catalog", filetypes=[("Flag lists", "*.json *.txt"), ("All files", "*.*")])
+        if not fns:
+            return
+        versions = simpledialog.askstring("Catalog", "Clients these flags apply to (comma-separated, blank for any):",
+                                          initialvalue=",".join(CLIENT_FOLDERS), parent=self)
+        if versions is None:
+            return
+        versions = [v.strip() for v in versions.split(",") if v.strip()]
+
+        def work(task):
+            catalog = get_flag_catalog()
+            for n, fn in enumerate(fns):
+                task.check()
+                task.progress(n, len(fns), f"Importing {os.path.basename(fn)}")
+                catalog.import_file(fn, versions)
+            return catalog.count()
+        self.run_task("Importing catalog", work,
+                      on_done=lambda count: messagebox.showinfo("Catalog", f"Catalog now holds {count} flag(s)."))
+
+    def download_bootstrapper_ui(self):
+        self.btn_dl.config(state="disabled")
+
+        def done(result):
+            self.btn_dl.config(state="normal")
+            self.refresh_bs_status()
+            resumed = f"\nResumed from {result['resumed_from'] / 1048576:.1f} MB." if result["resumed_from"] else ""
+            messagebox.showinfo("Bootstrapper",
+                                f"Downloaded {BOOTSTRAPPER_FILE} ({result['bytes'] / 1048576:.1f} MB) "
+                                f"in {result['seconds']:.1f} s at {result['mb_per_s']} MB/s.{resumed}")
+
+        def failed(error):
+            self.btn_dl.config(state="normal")
+            messagebox.showerror("Bootstrapper", f"Download failed: {error}\n\nPress the button again to resume.")
+        self.run_task("Downloading bootstrapper", download_bootstrapper, on_done=done, on_error=failed,
+                      on_cancel=lambda: self.btn_dl.config(state="normal"))
+
+    def refresh_bs_status(self):
+        if os.path.exists(BOOTSTRAPPER_FILE):
+            size_mb = os.path.getsize(BOOTSTRAPPER_FILE) / (1024 * 1024)
+            self.bs_status.config(text=f"Found: {BOOTSTRAPPER_FILE} ({size_mb:.1f} MB)", foreground=self.fg)
+        else:
+            self.bs_status.config(text=f"Not found: {BOOTSTRAPPER_FILE}", foreground=self.warn)
+
+    def refresh_debug_info(self):
+        if self.debug_text is None:
+            # built (and filled) the first time the Debug tab is opened
+            return
+
+        def done(snapshot):
+            self.diagnostics = snapshot
+            self.debug_text.delete("1.0", tk.END)
+            self.debug_text.insert(tk.END, "\n".join(format_diagnostics(snapshot)))
+        self.run_task("Collecting debug info", lambda task: collect_diagnostics(task=task), on_done=done)
+        self.refresh_bs_status()
+
+    def export_diagnostics_ui(self):
+        path = filedialog.asksaveasfilename(title="Export diagnostics", defaultextension=".json",
+                                            initialfile="projexstrap-diagnostics.json",
+                                            filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        if not path:
+            return
+
+        def done(path):
+            messagebox.showinfo("Diagnostics", f"Saved to {path}")
+        self.run_task("Exporting diagnostics", lambda task: export_diagnostics(path, collect_diagnostics(task=task)),
+                      on_done=done, on_error=lambda e: messagebox.showerror("Diagnostics", str(e)))
+
+    def open_debug_window(self):
+        DebugWindow(self)
+
+class FastFlagsEditor(tk.Toplevel):
+    # The listbox only ever holds the rows that fit on screen; self.view is
+    # the filtered, sorted key list and self.offset the first visible row.
+    def __init__(self, parent, flags, on_save=None):
+        super().__init__(parent)
+        self.title("FastFlags Editor")
+        self.geometry("720x520")
+        self.configure(bg=parent.bg)
+        self.parent = parent
+        self.on_save = on_save
+        self.flags = dict(flags or {})
+        self.index = FlagIndex(self.flags)
+        self.view = self.index.search("")
+        self.offset = 0
+        self.rows = 20
+        self.selected_key = None
+        self._search_job = None
+        self.catalog = get_flag_catalog()
+        self._build_ui()
+
+    def _build_ui(self):
+        frame = ttk.Frame(self, style="Card.TFrame")
+        frame.pack(fill="both", expand=True, padx=16, pady=16)
+        left = ttk.Frame(frame, style="Card.TFrame")
+        left.pack(side="left", fill="y", padx=(8,12), pady=8)
+        ttk.Label(left, text="Flags", style="Sub.TLabel").pack(anchor="w", padx=8, pady=(6,6))
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", self._schedule_search)
+        ttk.Entry(left, textvariable=self.search_var).pack(fill="x", padx=6, pady=(0,4))
+        self.count_label = ttk.Label(left, text="", style="Sub.TLabel")
+        self.count_label.pack(anchor="w", padx=8, pady=(0,4))
+        listframe = ttk.Frame(left, style="Card.TFrame")
+        listframe.pack(fill="both", expand=True, padx=6, pady=(0,6))
+        self.listbox = tk.Listbox(listframe, width=38, height=self.rows, bg=self.parent.card, fg=self.parent.fg,
+                                  bd=0, highlightthickness=0, exportselection=False, activestyle="none")
+        self.listbox.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(listframe, orient="vertical", command=self.on_scroll)
+        self.scrollbar.pack(side="left", fill="y")
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<Configure>", self._on_resize)
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll_to(self.offset - (1 if e.delta > 0 else -1) * 3))
+        self.listbox.bind("<Button-4>", lambda e: self.scroll_to(self.offset - 3))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll_to(self.offset + 3))
+        self.listbox.bind("<Up>", lambda e: self.move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self.move_selection(1))
+        self.listbox.bind("<Prior>", lambda e: self.move_selection(-self.rows))
+        self.listbox.bind("<Next>", lambda e: self.move_selection(self.rows))
+
+        right = ttk.Frame(frame, style="Card.TFrame")
+        right.pack(side="left", fill="both", expand=True, padx=(0,8), pady=8)
+
+        ttk.Label(right, text="Key", style="Sub.TLabel").pack(anchor="w", padx=8, pady=(6,0))
+        self.entry_key = ttk.Entry(right)
+        self.entry_key.pack(fill="x", padx=8, pady=(0,2))
+        self.entry_key.bind("<KeyRelease>", self._schedule_suggest)
+        self.key_info = ttk.Label(right, text="", style="Sub.TLabel")
+        self.key_info.pack(anchor="w", padx=8, pady=(0,2))
+        self.suggestions = tk.Listbox(right, height=5, bg=self.parent.card, fg=self.parent.sub, bd=0,
+                                      highlightthickness=0, exportselection=False, activestyle="none")
+        self.suggestions.pack(fill="x", padx=8, pady=(0,8))
+        self.suggestions.bind("<<ListboxSelect>>", self.on_suggestion)
+        self._suggested = []
+        self._suggest_job = None
+
+        ttk.Label(right, text="Value", style="Sub.TLabel").pack(anchor="w", padx=8, pady=(6,0))
+        self.entry_value = ttk.Entry(right)
+        self.entry_value.pack(fill="x", padx=8, pady=(0,8))
+
+        btnf = ttk.Frame(right, style="TFrame")
+        btnf.pack(anchor="e", pady=8, padx=8)
+        ttk.Button(btnf, text="Add / Update", command=self.add_or_update).pack(side="left", padx=6)
+        ttk.Button(btnf, text="Remove", command=self.remove_selected).pack(side="left", padx=6)
+        ttk.Button(btnf, text="Import JSON", command=self.import_json).pack(side="left", padx=6)
+
+        bottom = ttk.Frame(right, style="TFrame")
+        bottom.pack(fill="x", padx=8, pady=(12,8))
+        ttk.Button(bottom, text="Save & Close", command=self.save_and_close).pack(side="right")
+
+        self.populate_list()
+
+    def _on_resize(self, evt):
+        linespace = tkfont.nametofont(self.listbox.cget("font")).metrics("linespace") + 1
+        rows = max(1, evt.height // linespace)
+        if rows != self.rows:
+            self.rows = rows
+            self.scroll_to(self.offset)
+
+    def _schedule_search(self, *args):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(120, self.apply_search)
+
+    def apply_search(self):
+        self._search_job = None
+        self.view = self.index.search(self.search_var.get())
+        self.offset = 0
+        self.populate_list()
+
+    def populate_list(self):
+        self.scroll_to(self.offset)
+
+    def render(self):
+        self.listbox.delete(0, tk.END)
+        rows = self.view[self.offset:self.offset + self.rows]
+        self.listbox.insert(tk.END, *(f"{k} = {self.flags[k]}" for k in rows))
+        if self.selected_key in rows:
+            self.listbox.selection_set(rows.index(self.selected_key))
+        total = len(self.view)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        shown = f"{total} of {len(self.index)}" if total != len(self.index) else str(total)
+        self.count_label.config(text=f"{shown} flag(s)")
+
+    def scroll_to(self, offset):
+        self.offset = max(0, min(int(offset), len(self.view) - self.rows))
+        self.render()
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * len(self.view))
+        elif action == "scroll":
+            step = self.rows if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def ensure_visible(self, key):
+        pos = bisect.bisect_left(self.view, key)
+        if pos >= len(self.view) or self.view[pos] != key:
+            return
+        if pos < self.offset:
+            self.scroll_to(pos)
+        elif pos >= self.offset + self.rows:
+            self.scroll_to(pos - self.rows + 1)
+        else:
+            self.render()
+
+    def select_key(self, key):
+        self.selected_key = key
+        self.ensure_visible(key)
+        self.entry_key.delete(0, tk.END)
+        self.entry_key.insert(0, key)
+        self.entry_value.delete(0, tk.END)
+        self.entry_value.insert(0, str(self.flags[key]))
+        self.show_key_info(key)
+
+    def _schedule_suggest(self, evt=None):
+        if self._suggest_job is not None:
+            self.after_cancel(self._suggest_job)
+        self._suggest_job = self.after(120, self.update_suggestions)
+
+    def update_suggestions(self):
+        self._suggest_job = None
+        key = self.entry_key.get().strip()
+        self._suggested = self.catalog.search(key, limit=8) if key else []
+        self.suggestions.delete(0, tk.END)
+        self.suggestions.insert(tk.END, *(e["name"] for e in self._suggested))
+        self.show_key_info(key)
+
+    def show_key_info(self, key):
+        entry = self.catalog.get(key) if key else None
+        if entry:
+            versions = ", ".join(entry["versions"]) or "any client"
+            default = "" if entry["default"] is None else f" · default {entry['default']}"
+            self.key_info.config(text=f"{entry['type']} · {entry['kind']} · {versions}{default}", foreground=self.parent.sub)
+        elif key and self.catalog.count():
+            prefix, kind = flag_type(key)
+            self.key_info.config(text=f"Not in catalog{f' ({prefix}, {kind})' if prefix else ''}", foreground=self.parent.warn)
+        else:
+            self.key_info.config(text="")
+
+    def on_suggestion(self, evt=None):
+        sel = self.suggestions.curselection()
+        if not sel or sel[0] >= len(self._suggested):
+            return
+        entry = self._suggested[sel[0]]
+        self.entry_key.delete(0, tk.END)
+        self.entry_key.insert(0, entry["name"])
+        if entry["name"] in self.flags:
+            value = self.flags[entry["name"]]
+        else:
+            value = "" if entry["default"] is None else entry["default"]
+        self.entry_value.delete(0, tk.END)
+        self.entry_value.insert(0, str(value))
+        self.show_key_info(entry["name"])
+
+    def move_selection(self, step):
+        if not self.view:
+            return "break"
+        pos = bisect.bisect_left(self.view, self.selected_key) if self.selected_key is not None else self.offset - step
+        pos = max(0, min(pos + step, len(self.view) - 1))
+        self.select_key(self.view[pos])
+        return "break"
+
+    def on_select(self, evt=None):
+        sel = self.listbox.curselection()
+        if not sel: return
+        pos = self.offset + sel[0]
+        if pos < len(self.view):
+            self.select_key(self.view[pos])
+
+    def add_or_update(self):
+        k = self.entry_key.get().strip()
+        v_raw = self.entry_value.get().strip()
+        if not k:
+            messagebox.showerror("Error", "Key cannot be empty")
+            return
+        val = parse_flag_value(k, v_raw)
+
+        def validated(issues):
+            if not self.winfo_exists():
+                return
+            if issues and not messagebox.askyesno("Catalog validation", f"{format_flag_issues(issues)}\n\nAdd anyway?", parent=self):
+                return
+            self.add_flag(k, val)
+        self.parent.run_task("Checking flag", lambda task: self.catalog.validate({k: val}), on_done=validated)
+
+    def add_flag(self, k, val):
+        self.flags[k] = val
+        if self.index.add(k) is not None and FlagIndex.matches(k, self.search_var.get().strip()):
+            bisect.insort(self.view, k)
+        self.selected_key = k
+        self.ensure_visible(k)
+
+    def remove_selected(self):
+        k = self.entry_key.get().strip()
+        if not k:
+            messagebox.showwarning("Remove", "No key provided")
+            return
+        if k in self.flags:
+            del self.flags[k]
+            self.index.remove(k)
+            pos = bisect.bisect_left(self.view, k)
+            if pos < len(self.view) and self.view[pos] == k:
+                del self.view[pos]
+            if self.selected_key == k:
+                self.selected_key = None
+            self.populate_list()
+            self.entry_key.delete(0, tk.END)
+            self.entry_value.delete(0, tk.END)
+        else:
+            messagebox.showinfo("Remove", "Key not found")
+
+    def import_json(self):
+        paths = self.parent.ask_import_paths(parent=self)
+        if not paths:
+            return
+        base = dict(self.flags)
+        policy = self.parent.merge_policy.get()
+
+        def work(task):
+            merged, report = merge_flag_files(paths, base, policy, task=task)
+            changed = {key: merged[key] for key in report["added"]}
+            changed.update((c["key"], merged[c["key"]]) for c in report["conflicts"])
+            task.progress(0, 0, "Checking imported flags against the catalog")
+            delta = {key: value for key, value in merged.items() if key not in base or base[key] != value}
+            return delta, report, self.catalog.validate(changed)
+
+        def done(result):
+            if not self.winfo_exists():
+                return
+            # only the imported changes, so edits made meanwhile survive
+            delta, report, issues = result
+            self.flags.update(delta)
+            self.index = FlagIndex(self.flags)
+            self.view = self.index.search(self.search_var.get())
+            self.populate_list()
+            msg = format_merge_report(report)
+            if issues:
+                messagebox.showwarning("Imported", f"{msg}\n\n{len(issues)} failed catalog validation:\n{format_flag_issues(issues)}", parent=self)
+            else:
+                messagebox.showinfo("Imported", msg, parent=self)
+
+        def failed(error):
+            if not self.winfo_exists():
+                return
+            if isinstance(error, MergeConflictError):
+                messagebox.showerror("Import aborted", f"{format_merge_report(error.report)}\n\nNothing was changed.", parent=self)
+            else:
+                messagebox.showerror("Error", f"Failed to import: {error}", parent=self)
+        self.parent.run_task("Importing FastFlags", work, on_done=done, on_error=failed)
+
+    def save_and_close(self):
+        if self.on_save:
+            self.on_save(self.flags)
+        self.destroy()
+
+class DebugWindow(tk.Toplevel):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Debug Information")
+        self.geometry("820x520")
+        self.configure(bg=parent.bg)
+        self.parent = parent
+        ttk.Button(self, text="Refresh", command=self.refresh).pack(anchor="e", padx=16, pady=(16, 0))
+        self.txt = tk.Text(self, bg=parent.card, fg=parent.fg, bd=0, padx=10, pady=8)
+        self.txt.pack(fill="both", expand=True, padx=16, pady=16)
+        if parent.diagnostics is not None:
+            # reuse the last snapshot (Debug tab or an earlier window);
+            # Refresh collects a new one after applies, launches or scans
+            self.show_snapshot(parent.diagnostics)
+        else:
+            self.refresh()
+
+    def refresh(self):
+        self.txt.configure(state="normal")
+        self.txt.delete("1.0", tk.END)
+        self.txt.insert("1.0", "Collecting...")
+        self.parent.run_task("Collecting debug info", lambda task: collect_diagnostics(task=task), on_done=self.show_snapshot)
+
+    def show_snapshot(self, snapshot):
+        self.parent.diagnostics = snapshot
+        if not self.winfo_exists():
+            return
+        self.txt.configure(state="normal")
+        self.txt.delete("1.0", tk.END)
+        self.txt.insert("1.0", "\n".join(format_diagnostics(snapshot)))
+        self.txt.configure(state="disabled")
+
+def main():
+    app = Projexstrap()
+    app.mainloop()
+
+if __name__ == "__main__":
+    main()